@@ -17,7 +17,7 @@ from PySide6.QtWidgets import (
     QSlider,
     QCheckBox,
 )
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QPixmap, QKeySequence, QShortcut
 from PySide6.QtCore import Qt, QTimer
 
 from gui.tasks_window import TasksDialog
@@ -199,6 +199,8 @@ class MainWindow(QMainWindow):
         clipboard_row.setContentsMargins(0, 0, 0, 10)
         self.main_layout.addLayout(clipboard_row)
         setup_animation(cv_btn, ctx)
+        self.cancel_ocr_shortcut = QShortcut(QKeySequence(Qt.Key_Escape), self)
+        self.cancel_ocr_shortcut.activated.connect(self.cancel_clipboard_ocr)
 
         action_row = QHBoxLayout()
         generate_btn = QPushButton("Сгенерировать")
@@ -393,6 +395,11 @@ class MainWindow(QMainWindow):
 
         recognize_from_clipboard(self.ctx)
 
+    def cancel_clipboard_ocr(self):
+        from logic.ocr_paddle import cancel_clipboard_ocr
+
+        cancel_clipboard_ocr(self.ctx)
+
     def show_settings_dialog(self):
         from gui.settings_window import SettingsDialog
 
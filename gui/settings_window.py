@@ -14,10 +14,13 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QGroupBox,
     QFormLayout,
+    QSpinBox,
 )
 from PySide6.QtCore import Qt
 
 from logic.app_state import UIContext
+from logic.ocr_debug import DEBUG_MODES
+from logic.ocr_engines import DEFAULT_ENGINE, ENGINES, engine_availability
 from gui.themes import THEME_QSS, apply_theme
 from gui import ToggleSwitch
 
@@ -46,6 +49,133 @@ class SettingsDialog(QDialog):
         row.addWidget(self.ocr_mode_combo)
         self.settings_layout.addLayout(row)
 
+        row_engine = QHBoxLayout()
+        row_engine.addWidget(QLabel("OCR движок:"))
+        self.ocr_engine_combo = QComboBox()
+        self.ocr_engine_combo.addItems(list(ENGINES.keys()))
+        # Движки без пакета или весов модели видны, но выбрать их нельзя
+        self._engine_availability = engine_availability()
+        for idx, reason in enumerate(self._engine_availability.values()):
+            if reason:
+                self.ocr_engine_combo.model().item(idx).setEnabled(False)
+                self.ocr_engine_combo.setItemData(
+                    idx, f"Недоступен: {reason}", Qt.ItemDataRole.ToolTipRole
+                )
+        self.ocr_engine_combo.setCurrentText(ctx.ocr_engine)
+        self.ocr_engine_combo.currentTextChanged.connect(self._on_engine_changed)
+        row_engine.addWidget(self.ocr_engine_combo)
+        # Сохранённый недоступный движок не перезаписывается, а показывается замена
+        self.ocr_engine_fallback_label = QLabel()
+        row_engine.addWidget(self.ocr_engine_fallback_label)
+        self._update_engine_fallback(ctx.ocr_engine)
+        self.settings_layout.addLayout(row_engine)
+
+        row_onnx = QHBoxLayout()
+        row_onnx.addWidget(QLabel("Потоки ONNX:"))
+        self.onnx_threads_spin = QSpinBox()
+        self.onnx_threads_spin.setRange(0, 64)
+        self.onnx_threads_spin.setSpecialValueText("авто")
+        self.onnx_threads_spin.setValue(ctx.ocr_onnx_threads)
+        self.onnx_threads_spin.valueChanged.connect(
+            lambda val: setattr(ctx, "ocr_onnx_threads", val)
+        )
+        row_onnx.addWidget(self.onnx_threads_spin)
+        self.onnx_int8_checkbox = QCheckBox("int8")
+        self.onnx_int8_checkbox.setChecked(ctx.ocr_onnx_int8)
+        self.onnx_int8_checkbox.stateChanged.connect(
+            lambda val: setattr(ctx, "ocr_onnx_int8", bool(val))
+        )
+        row_onnx.addWidget(self.onnx_int8_checkbox)
+        self.settings_layout.addLayout(row_onnx)
+
+        row_warmup = QHBoxLayout()
+        self.warmup_checkbox = QCheckBox("Загружать OCR при запуске")
+        self.warmup_checkbox.setChecked(ctx.ocr_warmup)
+        self.warmup_checkbox.stateChanged.connect(
+            lambda val: setattr(ctx, "ocr_warmup", bool(val))
+        )
+        row_warmup.addWidget(self.warmup_checkbox)
+        self.settings_layout.addLayout(row_warmup)
+
+        row_unload = QHBoxLayout()
+        row_unload.addWidget(QLabel("Выгружать OCR после простоя:"))
+        self.idle_unload_spin = QSpinBox()
+        self.idle_unload_spin.setRange(0, 480)
+        self.idle_unload_spin.setSuffix(" мин")
+        self.idle_unload_spin.setSpecialValueText("никогда")
+        self.idle_unload_spin.setValue(ctx.ocr_idle_unload)
+        self.idle_unload_spin.valueChanged.connect(
+            lambda val: setattr(ctx, "ocr_idle_unload", val)
+        )
+        row_unload.addWidget(self.idle_unload_spin)
+        self.preload_checkbox = QCheckBox("подгружать в фоне")
+        self.preload_checkbox.setToolTip(
+            "Загружать модель снова при фокусе окна или копировании изображения"
+        )
+        self.preload_checkbox.setChecked(ctx.ocr_preload)
+        self.preload_checkbox.stateChanged.connect(
+            lambda val: setattr(ctx, "ocr_preload", bool(val))
+        )
+        row_unload.addWidget(self.preload_checkbox)
+        self.settings_layout.addLayout(row_unload)
+
+        row_workers = QHBoxLayout()
+        row_workers.addWidget(QLabel("Процессы OCR:"))
+        self.ocr_workers_spin = QSpinBox()
+        self.ocr_workers_spin.setRange(0, 8)
+        self.ocr_workers_spin.setSpecialValueText("в приложении")
+        self.ocr_workers_spin.setToolTip(
+            "Распознавать в отдельных процессах: интерфейс не подвисает, "
+            "а сбой OCR не закрывает программу"
+        )
+        self.ocr_workers_spin.setValue(ctx.ocr_workers)
+        self.ocr_workers_spin.valueChanged.connect(
+            lambda val: setattr(ctx, "ocr_workers", val)
+        )
+        row_workers.addWidget(self.ocr_workers_spin)
+        self.settings_layout.addLayout(row_workers)
+
+        row_watch = QHBoxLayout()
+        self.clipboard_watch_checkbox = QCheckBox("Распознавать скриншот сразу после копирования")
+        self.clipboard_watch_checkbox.setChecked(ctx.ocr_clipboard_watch)
+        self.clipboard_watch_checkbox.stateChanged.connect(
+            lambda val: setattr(ctx, "ocr_clipboard_watch", bool(val))
+        )
+        row_watch.addWidget(self.clipboard_watch_checkbox)
+        self.settings_layout.addLayout(row_watch)
+
+        self.ocr_memory_label = QLabel(self._ocr_memory_text())
+        self.settings_layout.addWidget(self.ocr_memory_label)
+
+        row_cache = QHBoxLayout()
+        self.ocr_cache_checkbox = QCheckBox("Кешировать результаты OCR")
+        self.ocr_cache_checkbox.setChecked(ctx.ocr_cache_enabled)
+        self.ocr_cache_checkbox.stateChanged.connect(
+            lambda val: setattr(ctx, "ocr_cache_enabled", bool(val))
+        )
+        row_cache.addWidget(self.ocr_cache_checkbox)
+        self.ocr_cache_persist_checkbox = QCheckBox("между запусками")
+        self.ocr_cache_persist_checkbox.setChecked(ctx.ocr_cache_persist)
+        self.ocr_cache_persist_checkbox.stateChanged.connect(
+            lambda val: setattr(ctx, "ocr_cache_persist", bool(val))
+        )
+        row_cache.addWidget(self.ocr_cache_persist_checkbox)
+        self.settings_layout.addLayout(row_cache)
+
+        row_debug = QHBoxLayout()
+        row_debug.addWidget(QLabel("Отладка OCR:"))
+        self.ocr_debug_combo = QComboBox()
+        for mode, title in DEBUG_MODES.items():
+            self.ocr_debug_combo.addItem(title, mode)
+        self.ocr_debug_combo.setCurrentIndex(
+            max(0, self.ocr_debug_combo.findData(ctx.ocr_debug_mode))
+        )
+        self.ocr_debug_combo.currentIndexChanged.connect(
+            lambda idx: setattr(ctx, "ocr_debug_mode", self.ocr_debug_combo.itemData(idx))
+        )
+        row_debug.addWidget(self.ocr_debug_combo)
+        self.settings_layout.addLayout(row_debug)
+
         # theme selector
         row_theme = QHBoxLayout()
         row_theme.addWidget(QLabel("Тема:"))
@@ -149,7 +279,7 @@ class SettingsDialog(QDialog):
         save_layout.addRow("Тему", self.save_theme_sw)
         self.save_ocr_sw = ToggleSwitch()
         self.save_ocr_sw.setChecked(ctx.settings.save_ocr_mode)
-        save_layout.addRow("OCR (GPU/CPU)", self.save_ocr_sw)
+        save_layout.addRow("OCR (движок, GPU/CPU)", self.save_ocr_sw)
         self.save_anim_sw = ToggleSwitch()
         self.save_anim_sw.setChecked(ctx.settings.save_animation_effect)
         save_layout.addRow("Эффект анимации", self.save_anim_sw)
@@ -168,6 +298,33 @@ class SettingsDialog(QDialog):
         save_btn.clicked.connect(self.save_and_close)
         main_layout.addWidget(save_btn)
 
+    @staticmethod
+    def _ocr_memory_text() -> str:
+        from logic.ocr_paddle import ocr_memory_usage
+
+        usage = ocr_memory_usage()
+        if usage["models"]:
+            models = f"модели {usage['models_mb']:.0f} МБ ({usage['models']} шт.)"
+        elif not usage["workers"]:
+            models = "модель не загружена"
+        else:
+            models = "модель в процессах OCR"
+        text = f"Память OCR: {models}, процесс {usage['process_mb']:.0f} МБ"
+        if usage["workers"]:
+            text += f", процессы OCR {usage['workers_mb']:.0f} МБ ({usage['workers']} шт.)"
+        return text
+
+    def _on_engine_changed(self, name: str) -> None:
+        self.ctx.ocr_engine = name
+        self._update_engine_fallback(name)
+
+    def _update_engine_fallback(self, name: str) -> None:
+        reason = self._engine_availability.get(name, "неизвестный движок")
+        self.ocr_engine_fallback_label.setText(
+            f"недоступен ({reason}), используется {DEFAULT_ENGINE}" if reason else ""
+        )
+        self.ocr_engine_fallback_label.setVisible(bool(reason))
+
     def _on_mode_changed(self, mode: str) -> None:
         self.ctx.ocr_mode = mode
 
@@ -213,6 +370,9 @@ class SettingsDialog(QDialog):
         """Сохранить выбранные настройки и закрыть окно."""
         self.ctx.settings.theme = self.ctx.current_theme_name
         self.ctx.settings.ocr_mode = self.ctx.ocr_mode
+        self.ctx.settings.ocr_engine = self.ctx.ocr_engine
+        self.ctx.settings.ocr_onnx_threads = self.ctx.ocr_onnx_threads
+        self.ctx.settings.ocr_onnx_int8 = self.ctx.ocr_onnx_int8
         self.ctx.settings.animation_effect = self.ctx.animation_effect
         self.ctx.settings.auto_copy = self.ctx.auto_copy_enabled
         self.ctx.settings.auto_generate = self.ctx.auto_generate_after_autofill
@@ -220,6 +380,14 @@ class SettingsDialog(QDialog):
         self.ctx.settings.deepl_api_key = self.ctx.deepl_api_key
         self.ctx.settings.translator = self.ctx.translator
         self.ctx.settings.show_help_icons = self.ctx.show_help_icons
+        self.ctx.settings.ocr_warmup = self.ctx.ocr_warmup
+        self.ctx.settings.ocr_idle_unload = self.ctx.ocr_idle_unload
+        self.ctx.settings.ocr_preload = self.ctx.ocr_preload
+        self.ctx.settings.ocr_workers = self.ctx.ocr_workers
+        self.ctx.settings.ocr_clipboard_watch = self.ctx.ocr_clipboard_watch
+        self.ctx.settings.ocr_cache = self.ctx.ocr_cache_enabled
+        self.ctx.settings.ocr_cache_persist = self.ctx.ocr_cache_persist
+        self.ctx.settings.ocr_debug_mode = self.ctx.ocr_debug_mode
 
         self.ctx.settings.save_theme = self.save_theme_sw.isChecked()
         self.ctx.settings.save_ocr_mode = self.save_ocr_sw.isChecked()
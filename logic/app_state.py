@@ -59,6 +59,19 @@ class UIContext:
         self.ocr_mode = (
             self.settings.ocr_mode if self.settings.save_ocr_mode else "CPU"
         )  # "CPU" или "GPU"
+        self.ocr_engine = (
+            self.settings.ocr_engine if self.settings.save_ocr_mode else "EasyOCR"
+        )
+        self.ocr_onnx_threads = self.settings.ocr_onnx_threads
+        self.ocr_onnx_int8 = self.settings.ocr_onnx_int8
+        self.ocr_warmup = self.settings.ocr_warmup
+        self.ocr_idle_unload = self.settings.ocr_idle_unload  # минуты, 0 — не выгружать
+        self.ocr_preload = self.settings.ocr_preload
+        self.ocr_workers = self.settings.ocr_workers  # 0 — OCR в процессе приложения
+        self.ocr_clipboard_watch = self.settings.ocr_clipboard_watch
+        self.ocr_cache_enabled = self.settings.ocr_cache
+        self.ocr_cache_persist = self.settings.ocr_cache_persist
+        self.ocr_debug_mode = self.settings.ocr_debug_mode  # "off", "on_failure", "always"
 
         
         self.auto_copy_enabled = (
@@ -0,0 +1,191 @@
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from PIL import Image
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp", ".tif", ".tiff"}
+
+_worker_options: Dict = {}
+
+
+def find_images(root: str | Path) -> List[Path]:
+    """Найти все изображения в папке (рекурсивно)."""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+
+
+def _init_worker(
+    engine: str,
+    use_gpu: bool,
+    engine_options: Dict,
+    torch_threads: int,
+    log_level: int,
+) -> None:
+    """Загрузить модель OCR один раз на процесс."""
+    global _worker_options
+    logging.getLogger().setLevel(log_level)
+    if torch_threads > 0:
+        try:
+            import torch
+
+            torch.set_num_threads(torch_threads)
+        except Exception:
+            pass
+    from logic.ocr_paddle import _init_ocr
+
+    _init_ocr(use_gpu, engine, engine_options)
+    _worker_options = {
+        "engine": engine,
+        "use_gpu": use_gpu,
+        "engine_options": engine_options,
+    }
+
+
+def process_file(path: str) -> Dict:
+    """Распознать одно изображение и вернуть запись с полями и таймингами."""
+    from constants import rooms_by_bz
+    from logic.ocr_paddle import (
+        ROOM_FUZZY_THRESHOLD,
+        fields_from_lines,
+        run_ocr,
+        validate_with_rooms,
+    )
+
+    record: Dict = {"file": path}
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        t = time.perf_counter()
+        image = Image.open(path).convert("RGB")
+        timings["load"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        lines, meeting_type = run_ocr(image, use_cache=False, **_worker_options)
+        timings["ocr"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        parsed, scores = fields_from_lines(lines)
+        timings["parse"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        validated = validate_with_rooms(
+            parsed, rooms_by_bz, fuzzy_threshold=ROOM_FUZZY_THRESHOLD
+        )
+        timings["validate"] = time.perf_counter() - t
+
+        record.update({
+            "ok": True,
+            "fields": validated,
+            "raw": parsed,
+            "scores": scores,
+            "meeting_type": meeting_type,
+            "lines": len(lines),
+        })
+    except Exception as e:
+        logging.error("[BATCH] %s: %s", path, e)
+        record.update({"ok": False, "error": str(e)})
+    timings["total"] = time.perf_counter() - start
+    record["timings"] = {k: round(v * 1000, 1) for k, v in timings.items()}
+    record["pid"] = os.getpid()
+    return record
+
+
+def run_batch(
+    root: str | Path,
+    *,
+    workers: int = 0,
+    engine: str = "EasyOCR",
+    use_gpu: bool = False,
+    engine_options: Dict | None = None,
+    isolate: bool = False,
+) -> Iterator[Dict]:
+    """Распознать все изображения папки пулом процессов.
+
+    Каждый процесс держит свой прогретый экземпляр модели, записи
+    возвращаются по мере готовности. При ``isolate`` распознавание идёт в
+    постоянных процессах OCR: упавший процесс перезапускается, а файл
+    получает запись с ошибкой вместо остановки всего прогона.
+    """
+    paths = [str(p) for p in find_images(root)]
+    if not paths:
+        return
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if isolate:
+        from logic.ocr_worker import shutdown_workers
+
+        _worker_options.update({
+            "engine": engine,
+            "use_gpu": use_gpu,
+            "engine_options": engine_options or {},
+            "workers": workers,
+        })
+        try:
+            with ThreadPoolExecutor(workers) as executor:
+                futures = [executor.submit(process_file, p) for p in paths]
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            shutdown_workers()
+        return
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    initargs = (
+        engine,
+        use_gpu,
+        engine_options or {},
+        torch_threads,
+        logging.getLogger().level,
+    )
+    with multiprocessing.get_context("spawn").Pool(
+        workers, initializer=_init_worker, initargs=initargs
+    ) as pool:
+        yield from pool.imap_unordered(process_file, paths)
+
+
+def main(argv: List[str]) -> None:
+    """Точка входа ``python -m logic.ocr_paddle batch <dir>``."""
+    import argparse
+
+    from logic.ocr_engines import DEFAULT_ENGINE, ENGINES
+
+    parser = argparse.ArgumentParser(prog="python -m logic.ocr_paddle batch")
+    parser.add_argument("path", help="папка со скриншотами или один файл")
+    parser.add_argument("-o", "--output", help="файл JSONL (по умолчанию stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="число процессов")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=list(ENGINES))
+    parser.add_argument("--gpu", action="store_true")
+    parser.add_argument("--isolate", action="store_true",
+                        help="перезапускать процесс OCR после сбоя вместо остановки")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    start = time.perf_counter()
+    try:
+        for record in run_batch(
+            args.path,
+            workers=args.workers,
+            engine=args.engine,
+            use_gpu=args.gpu,
+            isolate=args.isolate,
+        ):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"[BATCH] {count} images in {elapsed:.1f}s ({rate:.2f} img/s)", file=sys.stderr)
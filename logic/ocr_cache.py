@@ -0,0 +1,120 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+def image_hash(image: Image.Image | np.ndarray) -> str:
+    """Вернуть ключ кеша изображения — точный хеш, а не перцептивный.
+
+    Хеш считается по уменьшенной вдвое градации серого с квантованием до
+    16 уровней. Ключ совпадает только для того же скриншота (повторное
+    копирование или распознавание): шум сжатия, сглаживание ClearType или
+    сдвиг окна на пиксель его меняют, и кеш промахивается. Перцептивные
+    хеши вроде dHash 8×8 не используются намеренно: карточки, отличающиеся
+    лишь временем или переговоркой, получили бы один ключ и чужие поля.
+    Массив RGB читается на месте, без копии полного кадра.
+    """
+    if isinstance(image, Image.Image):
+        image = np.asarray(image.convert("RGB"))
+    h, w = image.shape[:2]
+    small = cv2.resize(image, (max(1, w // 2), max(1, h // 2)), interpolation=cv2.INTER_AREA)
+    data = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY) >> 4
+    digest = hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+    return f"{w}x{h}:{digest}"
+
+
+class OcrCache:
+    """LRU-кеш результатов OCR с ограничением по размеру и возрасту."""
+
+    def __init__(
+        self,
+        max_size: int = 32,
+        max_age: float = 3600.0,
+        path: str | Path | None = None,
+    ) -> None:
+        """Создать кеш и при наличии ``path`` загрузить его с диска."""
+        self.max_size = max_size
+        self.max_age = max_age
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.load()
+
+    def get(self, key: str) -> Tuple[List[Dict], str] | None:
+        """Вернуть ``(lines, meeting_type)`` по ключу или ``None``."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and time.time() - item["time"] > self.max_age:
+                del self._items[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return [dict(l) for l in item["lines"]], item["meeting_type"]
+
+    def put(self, key: str, lines: List[Dict], meeting_type: str) -> None:
+        """Сохранить результат распознавания."""
+        with self._lock:
+            self._items[key] = {
+                "time": time.time(),
+                "lines": [dict(l) for l in lines],
+                "meeting_type": meeting_type,
+            }
+            self._items.move_to_end(key)
+            self._evict()
+        self.save()
+
+    def clear(self) -> None:
+        """Очистить кеш и счётчики."""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+        self.save()
+
+    def stats(self) -> Dict[str, int]:
+        """Вернуть размер кеша и число попаданий/промахов."""
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+    def _evict(self) -> None:
+        now = time.time()
+        for key in [k for k, v in self._items.items() if now - v["time"] > self.max_age]:
+            del self._items[key]
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def load(self) -> None:
+        """Загрузить кеш из файла."""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            with self._lock:
+                self._items = OrderedDict(data)
+                self._evict()
+        except Exception as e:
+            logging.warning("[OCR] Failed to load OCR cache: %s", e)
+
+    def save(self) -> None:
+        """Сохранить кеш в файл."""
+        if not self.path:
+            return
+        with self._lock:
+            data = dict(self._items)
+        try:
+            self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        except Exception as e:
+            logging.warning("[OCR] Failed to save OCR cache: %s", e)
@@ -0,0 +1,174 @@
+import json
+import logging
+import queue
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+
+# Режимы отладочной записи OCR
+DEBUG_OFF = "off"
+DEBUG_ON_FAILURE = "on_failure"
+DEBUG_ALWAYS = "always"
+DEBUG_MODES = {
+    DEBUG_OFF: "Выкл",
+    DEBUG_ON_FAILURE: "При ошибке",
+    DEBUG_ALWAYS: "Всегда",
+}
+
+DEBUG_DIR = Path(__file__).resolve().parent.parent / "ocr_debug"
+DEBUG_QUEUE_SIZE = 4
+DEBUG_KEEP = 20
+
+
+def save_debug_ocr_image(
+    image: Image.Image | np.ndarray,
+    lines: List[Dict],
+    path: str = "ocr_debug_output.jpg",
+    *,
+    offset: Tuple[int, int] = (0, 0),
+    meta: Dict | None = None,
+    repeat_bbox: Tuple[int, int, int, int] | None = None,
+    checkbox_bbox: Tuple[int, int, int, int] | None = None,
+    checkbox_checked: bool | None = None,
+):
+    """Сохранить изображение с разметкой и JSON для отладки.
+
+    ``offset`` — положение ``image`` в координатах рамок ``lines``,
+    ``meta`` — дополнительные параметры распознавания (например, масштаб).
+    Массив RGB копируется один раз — в изображение, на котором рисуется разметка.
+    """
+
+    if not lines:
+        return
+    ox, oy = offset
+
+    img_copy = Image.fromarray(image) if isinstance(image, np.ndarray) else image.copy()
+    draw = ImageDraw.Draw(img_copy)
+
+    try:
+        font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 16)
+    except Exception:
+        font = ImageFont.load_default()
+
+    for line in lines:
+        bbox = [(p[0] - ox, p[1] - oy) for p in line["bbox"]]
+        draw.polygon(bbox, outline="red", width=2)
+        text = f"{line['text']} {line['score']:.2f}"
+        draw.text((bbox[0][0], bbox[0][1] - 15), text, fill="red", font=font)
+
+    if repeat_bbox:
+        x, y, w, h = repeat_bbox
+        x, y = x - ox, y - oy
+        draw.rectangle([x, y, x + w, y + h], outline="blue", width=2)
+    if checkbox_bbox:
+        x, y, w, h = checkbox_bbox
+        x, y = x - ox, y - oy
+        color = "green" if checkbox_checked else "red"
+        draw.rectangle([x, y, x + w, y + h], outline=color, width=2)
+
+    img_copy.save(path)
+
+    debug_info = {
+        **(meta or {}),
+        "offset": list(offset),
+        "lines": [
+            {"text": line["text"], "score": line["score"], "bbox": line["bbox"]}
+            for line in lines
+        ],
+    }
+    with open(Path(path).with_suffix(".json"), "w", encoding="utf-8") as f:
+        json.dump(debug_info, f, ensure_ascii=False, indent=2)
+
+
+def _write_capture(capture: Dict, directory: Path) -> None:
+    """Записать одну отладочную запись в отдельную папку."""
+    directory.mkdir(parents=True, exist_ok=True)
+    image = capture["image"]
+    save_debug_ocr_image(
+        image,
+        capture["lines"],
+        str(directory / "ocr_debug_output.jpg"),
+        offset=capture.get("offset", (0, 0)),
+        meta=capture.get("meta"),
+        repeat_bbox=capture.get("repeat_bbox"),
+        checkbox_bbox=capture.get("checkbox_bbox"),
+        checkbox_checked=capture.get("checkbox_checked"),
+    )
+    checkbox_bbox = capture.get("checkbox_bbox")
+    if checkbox_bbox:
+        ox, oy = capture.get("offset", (0, 0))
+        x, y, w, h = checkbox_bbox
+        box = (x - ox, y - oy, x - ox + w, y - oy + h)
+        if isinstance(image, np.ndarray):
+            roi = Image.fromarray(np.ascontiguousarray(image[box[1]:box[3], box[0]:box[2]]))
+        else:
+            roi = image.crop(box)
+        roi.save(directory / "checkbox_roi.png")
+
+
+class DebugWriter:
+    """Фоновая запись отладочных изображений OCR.
+
+    Записи кладутся в ограниченную очередь и сохраняются отдельным потоком
+    в папки с отметкой времени; хранятся только последние ``keep`` папок.
+    Если очередь заполнена, запись отбрасывается, чтобы не тормозить OCR.
+    """
+
+    def __init__(
+        self,
+        root: str | Path = DEBUG_DIR,
+        max_queue: int = DEBUG_QUEUE_SIZE,
+        keep: int = DEBUG_KEEP,
+    ) -> None:
+        self.root = Path(root)
+        self.keep = keep
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, capture: Dict) -> bool:
+        """Поставить запись в очередь, вернуть ``False``, если очередь полна."""
+        if not capture.get("lines"):
+            return False
+        try:
+            self._queue.put_nowait(capture)
+        except queue.Full:
+            logging.warning("[OCR] Debug queue is full, capture dropped")
+            return False
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ocr-debug-writer", daemon=True
+                )
+                self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            capture = self._queue.get()
+            try:
+                stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+                _write_capture(capture, self.root / stamp)
+                self._rotate()
+            except Exception as e:
+                logging.error("[OCR] Failed to write debug capture: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def _rotate(self) -> None:
+        dirs = sorted(p for p in self.root.iterdir() if p.is_dir())
+        for old in dirs[: max(0, len(dirs) - self.keep)]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def flush(self) -> None:
+        """Дождаться записи всех поставленных в очередь изображений."""
+        self._queue.join()
+
+
+debug_writer = DebugWriter()
@@ -0,0 +1,358 @@
+import importlib.util
+import logging
+import os
+from typing import Any, List, Tuple
+
+import numpy as np
+
+
+MODELS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "ocr_models"
+)
+PADDLE_DET_DIR = os.path.join(MODELS_DIR, "det", "Multilingual_PP-OCRv3_det_infer")
+PADDLE_REC_DIR = os.path.join(MODELS_DIR, "rec", "cyrillic_PP-OCRv3_rec_infer")
+PADDLE_CLS_DIR = os.path.join(MODELS_DIR, "cls", "ch_ppocr_mobile_v2.0_cls_infer")
+ONNX_DIR = os.path.join(MODELS_DIR, "onnx")
+ONNX_DETECTOR = "craft_detector"
+ONNX_RECOGNIZER = "cyrillic_recognizer"
+
+
+def onnx_model_path(name: str, quantized: bool = False) -> str:
+    """Вернуть путь к ONNX-модели (обычной или int8)."""
+    suffix = ".int8.onnx" if quantized else ".onnx"
+    return os.path.join(ONNX_DIR, name + suffix)
+
+
+# Результат распознавания в формате EasyOCR: (bbox, text, score)
+OcrResult = List[Tuple[List[List[float]], str, float]]
+
+
+class OcrEngine:
+    """Базовый интерфейс движка OCR.
+
+    Движок принимает RGB-изображение в виде массива NumPy и возвращает
+    строки в формате ``easyocr.Reader.readtext``.
+    """
+
+    name = ""
+    # Движок умеет искать рамки отдельно от распознавания (detect)
+    can_detect = False
+    languages: tuple = ()
+
+    @classmethod
+    def unavailable_reason(cls) -> str | None:
+        """Вернуть причину, по которой движок нельзя создать, или ``None``."""
+        return None
+
+    def readtext(self, image: np.ndarray) -> OcrResult:
+        """Распознать текст на изображении."""
+        raise NotImplementedError
+
+    def recognize(self, image: np.ndarray, allowlist: str | None = None) -> OcrResult:
+        """Распознать фрагмент с одной строкой текста без поиска рамок.
+
+        ``allowlist`` ограничивает набор символов, если движок это умеет.
+        По умолчанию фрагмент распознаётся обычным ``readtext``.
+        """
+        return self.readtext(image)
+
+    def detect(self, image: np.ndarray) -> List[List[List[float]]]:
+        """Найти рамки строк текста без распознавания (если ``can_detect``)."""
+        raise NotImplementedError
+
+    def recognize_boxes(
+        self,
+        image: np.ndarray,
+        boxes: List[List[List[float]]],
+        allowlist: str | None = None,
+    ) -> OcrResult:
+        """Распознать текст только внутри заданных рамок."""
+        result: OcrResult = []
+        for box in boxes:
+            x1, y1, x2, y2 = _box_rect(box, image)
+            if x2 <= x1 or y2 <= y1:
+                continue
+            for _, text, score in self.recognize(image[y1:y2, x1:x2], allowlist):
+                result.append((box, text, score))
+        return result
+
+
+def _full_box(image: np.ndarray) -> List[List[float]]:
+    h, w = image.shape[:2]
+    return [[0, 0], [w, 0], [w, h], [0, h]]
+
+
+def _box_rect(box: List[List[float]], image: np.ndarray) -> Tuple[int, int, int, int]:
+    """Вернуть ``(x1, y1, x2, y2)`` рамки, обрезанной по границам изображения."""
+    h, w = image.shape[:2]
+    xs = [p[0] for p in box]
+    ys = [p[1] for p in box]
+    return (
+        max(int(min(xs)), 0),
+        max(int(min(ys)), 0),
+        min(int(max(xs)) + 1, w),
+        min(int(max(ys)) + 1, h),
+    )
+
+
+class EasyOcrEngine(OcrEngine):
+    """Движок на основе EasyOCR и PyTorch."""
+
+    name = "EasyOCR"
+    can_detect = True
+    languages = ("ru", "en")
+
+    def __init__(self, use_gpu: bool = False, **options):
+        try:
+            import easyocr
+        except Exception as e:
+            logging.error("[OCR] Failed to import EasyOCR: %s", e)
+            raise
+        self.reader: Any = easyocr.Reader(list(self.languages), gpu=use_gpu)
+
+    def readtext(self, image: np.ndarray) -> OcrResult:
+        return self.reader.readtext(image)
+
+    def recognize(self, image: np.ndarray, allowlist: str | None = None) -> OcrResult:
+        return self.recognize_boxes(image, [_full_box(image)], allowlist)
+
+    def detect(self, image: np.ndarray) -> List[List[List[float]]]:
+        horizontal, free = self.reader.detect(image)
+        boxes = [
+            [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+            for x1, x2, y1, y2 in horizontal[0]
+        ]
+        boxes.extend([[float(x), float(y)] for x, y in poly] for poly in free[0])
+        return boxes
+
+    def recognize_boxes(
+        self,
+        image: np.ndarray,
+        boxes: List[List[List[float]]],
+        allowlist: str | None = None,
+    ) -> OcrResult:
+        if not boxes:
+            return []
+        # Наклонные рамки распознаются по описанному прямоугольнику
+        horizontal = []
+        for box in boxes:
+            x1, y1, x2, y2 = _box_rect(box, image)
+            horizontal.append([x1, x2, y1, y2])
+        return self.reader.recognize(
+            image,
+            horizontal_list=horizontal,
+            free_list=[],
+            allowlist=allowlist,
+        )
+
+
+def _missing_paddle_file(path: str) -> str | None:
+    """Вернуть первый отсутствующий файл модели Paddle inference или ``None``."""
+    for fname in ("inference.pdmodel", "inference.pdiparams"):
+        if not os.path.isfile(os.path.join(path, fname)):
+            return os.path.join(path, fname)
+    return None
+
+
+def _check_paddle_model(path: str) -> None:
+    """Проверить, что папка содержит полную модель Paddle inference."""
+    missing = _missing_paddle_file(path)
+    if missing:
+        raise FileNotFoundError(f"Не найден файл модели PaddleOCR: {missing}")
+
+
+class PaddleOcrEngine(OcrEngine):
+    """Движок PaddleOCR 2.x на моделях из ``data/ocr_models``.
+
+    Пакет ``paddleocr`` необязателен (см. ``requirements-paddle.txt``);
+    без него или без весов моделей движок недоступен в настройках.
+    """
+
+    name = "PaddleOCR"
+    can_detect = True
+    languages = ("cyrillic",)
+
+    @classmethod
+    def unavailable_reason(cls) -> str | None:
+        for path in (PADDLE_DET_DIR, PADDLE_REC_DIR, PADDLE_CLS_DIR):
+            missing = _missing_paddle_file(path)
+            if missing:
+                return f"нет файла модели {os.path.relpath(missing, MODELS_DIR)}"
+        if importlib.util.find_spec("paddleocr") is None:
+            return "не установлен пакет paddleocr"
+        return None
+
+    def __init__(self, use_gpu: bool = False, **options):
+        for path in (PADDLE_DET_DIR, PADDLE_REC_DIR, PADDLE_CLS_DIR):
+            _check_paddle_model(path)
+        try:
+            from paddleocr import PaddleOCR
+        except Exception as e:
+            logging.error("[OCR] Failed to import PaddleOCR: %s", e)
+            raise
+        self.reader: Any = PaddleOCR(
+            det_model_dir=PADDLE_DET_DIR,
+            rec_model_dir=PADDLE_REC_DIR,
+            cls_model_dir=PADDLE_CLS_DIR,
+            lang=self.languages[0],
+            use_angle_cls=True,
+            use_gpu=use_gpu,
+            show_log=False,
+        )
+
+    def readtext(self, image: np.ndarray) -> OcrResult:
+        # PaddleOCR ожидает BGR, как cv2
+        pages = self.reader.ocr(np.ascontiguousarray(image[:, :, ::-1]), cls=True)
+        result: OcrResult = []
+        for page in pages or []:
+            for bbox, (text, score) in page or []:
+                result.append((bbox, text, float(score)))
+        return result
+
+    def detect(self, image: np.ndarray) -> List[List[List[float]]]:
+        pages = self.reader.ocr(np.ascontiguousarray(image[:, :, ::-1]), rec=False)
+        return [[[float(x), float(y)] for x, y in box] for page in pages or [] for box in page or []]
+
+    def recognize(self, image: np.ndarray, allowlist: str | None = None) -> OcrResult:
+        pages = self.reader.ocr(np.ascontiguousarray(image[:, :, ::-1]), det=False, cls=True)
+        box = _full_box(image)
+        return [(box, text, float(score)) for page in pages or [] for text, score in page or []]
+
+
+class _OrtModule:
+    """Обёртка сессии onnxruntime с интерфейсом модели PyTorch.
+
+    EasyOCR вызывает детектор и распознаватель как ``torch.nn.Module``,
+    поэтому обёртка принимает и возвращает тензоры PyTorch, а пред- и
+    постобработка EasyOCR остаются без изменений.
+    """
+
+    def __init__(self, session: Any):
+        self.session = session
+        self.input_name = session.get_inputs()[0].name
+
+    def eval(self) -> "_OrtModule":
+        return self
+
+    def __call__(self, x: Any, *args: Any) -> Any:
+        import torch
+
+        outputs = self.session.run(None, {self.input_name: x.cpu().numpy()})
+        tensors = tuple(torch.from_numpy(o) for o in outputs)
+        return tensors if len(tensors) > 1 else tensors[0]
+
+
+class OnnxEasyOcrEngine(EasyOcrEngine):
+    """EasyOCR с детектором CRAFT и распознавателем в onnxruntime на CPU.
+
+    Модели создаются командой ``python -m logic.ocr_onnx export``.
+    """
+
+    name = "EasyOCR-ONNX"
+
+    @classmethod
+    def unavailable_reason(cls) -> str | None:
+        if importlib.util.find_spec("onnxruntime") is None:
+            return "не установлен пакет onnxruntime"
+        for name in (ONNX_DETECTOR, ONNX_RECOGNIZER):
+            path = onnx_model_path(name)
+            if not os.path.isfile(path) and not os.path.isfile(onnx_model_path(name, True)):
+                return f"нет модели {os.path.relpath(path, MODELS_DIR)}"
+        return None
+
+    def __init__(self, use_gpu: bool = False, *, threads: int = 0, quantized: bool = False):
+        det_path = onnx_model_path(ONNX_DETECTOR, quantized)
+        rec_path = onnx_model_path(ONNX_RECOGNIZER, quantized)
+        for path in (det_path, rec_path):
+            if not os.path.isfile(path):
+                raise FileNotFoundError(
+                    f"Не найдена ONNX-модель: {path}. "
+                    "Выполните: python -m logic.ocr_onnx export"
+                )
+        try:
+            import easyocr
+            import onnxruntime as ort
+            from easyocr.config import BASE_PATH
+            from easyocr.detection import get_textbox
+            from easyocr.utils import CTCLabelConverter
+        except Exception as e:
+            logging.error("[OCR] Failed to import onnxruntime/EasyOCR: %s", e)
+            raise
+
+        opts = ort.SessionOptions()
+        if threads > 0:
+            opts.intra_op_num_threads = threads
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ["CPUExecutionProvider"]
+
+        # Reader нужен ради пред- и постобработки. Сети PyTorch не создаются:
+        # их место занимают ONNX-сессии, а декодер и поиск рамок, которые
+        # Reader без сетей не заводит, подключаются здесь
+        reader: Any = easyocr.Reader(
+            list(self.languages), gpu=False, detector=False, recognizer=False
+        )
+        reader.detect_network = "craft"
+        reader.get_textbox = get_textbox
+        reader.detector = _OrtModule(ort.InferenceSession(det_path, opts, providers=providers))
+        reader.recognizer = _OrtModule(ort.InferenceSession(rec_path, opts, providers=providers))
+        reader.converter = CTCLabelConverter(
+            reader.character,
+            {},
+            {lang: os.path.join(BASE_PATH, "dict", lang + ".txt") for lang in self.languages},
+        )
+        self.reader = reader
+        logging.debug(
+            "[OCR] ONNX models loaded (threads=%s, int8=%s)", threads or "auto", quantized
+        )
+
+
+ENGINES: dict[str, type[OcrEngine]] = {
+    EasyOcrEngine.name: EasyOcrEngine,
+    OnnxEasyOcrEngine.name: OnnxEasyOcrEngine,
+    PaddleOcrEngine.name: PaddleOcrEngine,
+}
+
+DEFAULT_ENGINE = EasyOcrEngine.name
+
+
+def engine_availability() -> dict[str, str | None]:
+    """Вернуть для каждого движка причину недоступности или ``None``."""
+    return {name: cls.unavailable_reason() for name, cls in ENGINES.items()}
+
+
+_reported_fallbacks: set[str] = set()
+
+
+def resolve_engine(name: str) -> str:
+    """Вернуть имя движка, который будет работать вместо ``name``.
+
+    Неизвестный или недоступный движок заменяется ``DEFAULT_ENGINE``;
+    замена сообщается в журнал один раз.
+    """
+    engine_cls = ENGINES.get(name)
+    reason = "неизвестный движок" if engine_cls is None else engine_cls.unavailable_reason()
+    if not reason:
+        return name
+    if name not in _reported_fallbacks:
+        _reported_fallbacks.add(name)
+        logging.warning("[OCR] %s unavailable (%s), using %s", name, reason, DEFAULT_ENGINE)
+    return DEFAULT_ENGINE
+
+
+def create_engine(name: str, use_gpu: bool = False, **options) -> OcrEngine:
+    """Создать движок OCR по имени.
+
+    ``options`` передаются конструктору движка (например, ``threads`` и
+    ``quantized`` для EasyOCR-ONNX). Недоступный движок не подменяется:
+    замену выбирает вызывающий код через ``resolve_engine``.
+    """
+    engine_cls = ENGINES.get(name)
+    if engine_cls is None:
+        raise ValueError(f"Unknown OCR engine '{name}'")
+    reason = engine_cls.unavailable_reason()
+    if reason:
+        raise RuntimeError(f"{name} unavailable: {reason}")
+    logging.debug(
+        "[OCR] Initializing %s (GPU=%s, options=%s)", engine_cls.name, use_gpu, options
+    )
+    return engine_cls(use_gpu, **options)
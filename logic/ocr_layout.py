@@ -0,0 +1,153 @@
+import re
+from typing import Dict, List, Tuple
+
+# Токены-значения, которые нельзя склеивать с соседями (время, дата)
+_VALUE_TOKEN_RE = re.compile(r"^\d{1,2}[:.]\d{2}$|^\d{2}\.\d{2}\.\d{2,4}$|^[-–—]$")
+
+
+def box_rect(bbox: List[List[int]]) -> Tuple[int, int, int, int]:
+    """Вернуть ``(x1, y1, x2, y2)`` для многоугольника рамки."""
+    xs = [p[0] for p in bbox]
+    ys = [p[1] for p in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def near_anchor(
+    rect: Tuple[int, int, int, int],
+    anchor: Tuple[int, int, int, int],
+    rows_below: float = 4.0,
+) -> bool:
+    """Проверить, может ли рамка ``rect`` быть значением метки ``anchor``.
+
+    Подходят рамки справа от метки в её ряду и рамки ниже не дальше
+    ``rows_below`` высот метки, начинающиеся не левее её колонки.
+    """
+    x1, y1, x2, y2 = rect
+    ax1, ay1, ax2, ay2 = anchor
+    h = max(1, ay2 - ay1)
+    cy = (y1 + y2) / 2
+    if ay1 - h / 2 <= cy <= ay2 + h / 2:
+        return x1 >= ax1
+    return ay2 <= y1 <= ay2 + rows_below * h and x1 >= ax1 - h
+
+
+def add_geometry(line: Dict) -> Dict:
+    """Добавить к строке OCR поля ``x1, y1, x2, y2, cy, h``."""
+    x1, y1, x2, y2 = box_rect(line["bbox"])
+    line.update({"x1": x1, "y1": y1, "x2": x2, "y2": y2, "cy": (y1 + y2) / 2, "h": max(1, y2 - y1)})
+    return line
+
+
+def group_rows(lines: List[Dict], y_tolerance: float) -> List[List[Dict]]:
+    """Сгруппировать строки OCR в ряды одним проходом по отсортированным ``cy``.
+
+    Строка попадает в текущий ряд, если её центр отстоит от центра ряда
+    не больше чем на половину высоты (но не больше ``y_tolerance``).
+    Внутри ряда строки упорядочены слева направо.
+    """
+    rows: List[List[Dict]] = []
+    row_cy = 0.0
+    row_h = 0
+    for line in sorted(lines, key=lambda l: l["cy"]):
+        if rows:
+            tol = min(y_tolerance, max(row_h, line["h"]) / 2)
+            if abs(line["cy"] - row_cy) <= tol:
+                rows[-1].append(line)
+                n = len(rows[-1])
+                row_cy += (line["cy"] - row_cy) / n
+                row_h = max(row_h, line["h"])
+                continue
+        rows.append([line])
+        row_cy = line["cy"]
+        row_h = line["h"]
+    for row in rows:
+        row.sort(key=lambda l: l["x1"])
+    return rows
+
+
+def _mergeable(left: Dict, right: Dict, max_gap: float) -> bool:
+    if left.get("label") or right.get("label"):
+        return False
+    if _VALUE_TOKEN_RE.match(left["text"]) or _VALUE_TOKEN_RE.match(right["text"]):
+        return False
+    gap = right["x1"] - left["x2"]
+    return gap <= min(max_gap, 0.8 * max(left["h"], right["h"]))
+
+
+def merge_split_tokens(row: List[Dict], max_gap: float) -> List[Dict]:
+    """Склеить в ряду соседние фрагменты одного текста, разорванные OCR.
+
+    Метки, время и даты не склеиваются, чтобы не испортить значения.
+    """
+    merged: List[Dict] = []
+    for line in row:
+        if merged and _mergeable(merged[-1], line, max_gap):
+            prev = merged[-1]
+            x1, y1 = min(prev["x1"], line["x1"]), min(prev["y1"], line["y1"])
+            x2, y2 = max(prev["x2"], line["x2"]), max(prev["y2"], line["y2"])
+            text = f"{prev['text']} {line['text']}"
+            merged[-1] = add_geometry({
+                **prev,
+                "text": text,
+                "raw_text": text,
+                "norm": f"{prev['norm']} {line['norm']}",
+                "score": min(prev["score"], line["score"]),
+                "bbox": [[x1, y1], [x2, y1], [x2, y2], [x1, y2]],
+            })
+        else:
+            merged.append(line)
+    return merged
+
+
+class Layout:
+    """Строки OCR, разложенные по рядам, с поиском соседей по геометрии."""
+
+    def __init__(self, lines: List[Dict], *, y_tolerance: float, max_gap: float):
+        for line in lines:
+            add_geometry(line)
+        self.rows = [merge_split_tokens(r, max_gap) for r in group_rows(lines, y_tolerance)]
+        self._pos: Dict[int, Tuple[int, int]] = {}
+        for r, row in enumerate(self.rows):
+            for c, line in enumerate(row):
+                self._pos[id(line)] = (r, c)
+
+    def lines(self) -> List[Dict]:
+        """Вернуть строки в порядке чтения."""
+        return [line for row in self.rows for line in row]
+
+    def right_of(self, line: Dict) -> List[Dict]:
+        """Строки справа от ``line`` в том же ряду."""
+        r, c = self._pos[id(line)]
+        return self.rows[r][c + 1:]
+
+    def below(self, line: Dict, max_rows: int = 2) -> List[List[Dict]]:
+        """Ряды под ``line`` (не дальше ``max_rows``), выровненные по её колонке.
+
+        В ряд попадают только строки, начинающиеся не левее метки и не
+        правее её конца плюс ширина метки.
+        """
+        r, _ = self._pos[id(line)]
+        width = line["x2"] - line["x1"]
+        result: List[List[Dict]] = []
+        prev_bottom = line["y2"]
+        for row in self.rows[r + 1:r + 1 + max_rows]:
+            top = min(l["y1"] for l in row)
+            if top - prev_bottom > 3 * line["h"]:
+                break
+            column = [
+                l for l in row
+                if l["x2"] > line["x1"] - line["h"] and l["x1"] < line["x2"] + width
+            ]
+            if column:
+                result.append(column)
+            prev_bottom = max(l["y2"] for l in row)
+        return result
+
+    def value_candidates(self, line: Dict, max_rows: int = 2) -> List[List[Dict]]:
+        """Возможные значения метки: сначала справа в ряду, затем ниже."""
+        groups: List[List[Dict]] = []
+        right = self.right_of(line)
+        if right:
+            groups.append(right)
+        groups.extend(self.below(line, max_rows))
+        return groups
@@ -0,0 +1,180 @@
+"""Экспорт моделей EasyOCR в ONNX и сравнение скорости с PyTorch.
+
+Использование::
+
+    python -m logic.ocr_onnx export [--int8]
+    python -m logic.ocr_onnx benchmark screenshot1.png ... [--threads 4] [--int8]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import time
+from typing import Any, List
+
+import numpy as np
+from PIL import Image
+
+from logic.ocr_engines import (
+    EasyOcrEngine,
+    ONNX_DETECTOR,
+    ONNX_DIR,
+    ONNX_RECOGNIZER,
+    OnnxEasyOcrEngine,
+    onnx_model_path,
+)
+
+
+def _unwrap(model: Any) -> Any:
+    """Снять обёртку ``DataParallel``, если она есть."""
+    return getattr(model, "module", model)
+
+
+def export_easyocr_to_onnx(quantize: bool = False, opset: int = 13) -> List[str]:
+    """Экспортировать детектор CRAFT и кириллический распознаватель в ONNX.
+
+    При ``quantize`` дополнительно создаются int8-версии с динамической
+    квантизацией весов. Возвращает список созданных файлов.
+    """
+    import easyocr
+    import torch
+
+    os.makedirs(ONNX_DIR, exist_ok=True)
+    reader = easyocr.Reader(['ru', 'en'], gpu=False)
+    detector = _unwrap(reader.detector).eval()
+    recognizer = _unwrap(reader.recognizer).eval()
+
+    class _Recognizer(torch.nn.Module):
+        """Распознаватель без неиспользуемого аргумента ``text``."""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, x):
+            return self.model(x, None)
+
+    det_path = onnx_model_path(ONNX_DETECTOR)
+    rec_path = onnx_model_path(ONNX_RECOGNIZER)
+    with torch.no_grad():
+        torch.onnx.export(
+            detector,
+            torch.randn(1, 3, 640, 640),
+            det_path,
+            input_names=["image"],
+            output_names=["score", "feature"],
+            dynamic_axes={
+                "image": {0: "batch", 2: "height", 3: "width"},
+                "score": {0: "batch", 1: "out_height", 2: "out_width"},
+                "feature": {0: "batch", 2: "out_height", 3: "out_width"},
+            },
+            opset_version=opset,
+        )
+        torch.onnx.export(
+            _Recognizer(recognizer).eval(),
+            torch.randn(1, 1, 64, 256),
+            rec_path,
+            input_names=["image"],
+            output_names=["preds"],
+            dynamic_axes={
+                "image": {0: "batch", 3: "width"},
+                "preds": {0: "batch", 1: "steps"},
+            },
+            opset_version=opset,
+        )
+    created = [det_path, rec_path]
+    logging.info("[ONNX] Exported %s, %s", det_path, rec_path)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        for name, src in ((ONNX_DETECTOR, det_path), (ONNX_RECOGNIZER, rec_path)):
+            dst = onnx_model_path(name, quantized=True)
+            quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+            created.append(dst)
+            logging.info("[ONNX] Quantized %s -> %s", src, dst)
+    return created
+
+
+def _load_for_ocr(path: str) -> np.ndarray:
+    """Загрузить изображение и увеличить его так же, как ``run_ocr``."""
+    image = Image.open(path).convert("RGB")
+    image = image.resize((image.width * 2, image.height * 2), Image.LANCZOS)
+    return np.array(image)
+
+
+def benchmark(paths: List[str], *, threads: int = 0, quantized: bool = False, repeat: int = 3) -> dict:
+    """Сравнить EasyOCR (PyTorch) и EasyOCR-ONNX на наборе изображений.
+
+    Точность ONNX оценивается относительно PyTorch: доля совпавших строк
+    и средняя схожесть текста (rapidfuzz ``ratio``).
+    """
+    from rapidfuzz import fuzz
+
+    images = [_load_for_ocr(p) for p in paths]
+    engines = {
+        "torch": EasyOcrEngine(),
+        "onnx": OnnxEasyOcrEngine(threads=threads, quantized=quantized),
+    }
+    timings: dict[str, list[float]] = {name: [] for name in engines}
+    outputs: dict[str, list[list[str]]] = {name: [] for name in engines}
+
+    for name, engine in engines.items():
+        engine.readtext(images[0])  # прогрев
+        for img in images:
+            texts: list[str] = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = engine.readtext(img)
+                timings[name].append(time.perf_counter() - start)
+                texts = [text.strip() for _, text, _ in result]
+            outputs[name].append(texts)
+
+    exact = 0
+    total = 0
+    similarity: list[float] = []
+    for ref, got in zip(outputs["torch"], outputs["onnx"]):
+        total += len(ref)
+        exact += len(set(ref) & set(got))
+        similarity.append(fuzz.ratio("\n".join(ref), "\n".join(got)) / 100)
+
+    report = {
+        name: {
+            "mean_ms": round(statistics.mean(t) * 1000, 1),
+            "median_ms": round(statistics.median(t) * 1000, 1),
+        }
+        for name, t in timings.items()
+    }
+    report["speedup"] = round(report["torch"]["median_ms"] / report["onnx"]["median_ms"], 2)
+    report["line_match"] = round(exact / total, 3) if total else 1.0
+    report["text_similarity"] = round(statistics.mean(similarity), 3) if similarity else 1.0
+    return report
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m logic.ocr_onnx")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="экспортировать модели EasyOCR в ONNX")
+    exp.add_argument("--int8", action="store_true", help="создать int8-версии")
+
+    bench = sub.add_parser("benchmark", help="сравнить PyTorch и ONNX")
+    bench.add_argument("images", nargs="+")
+    bench.add_argument("--threads", type=int, default=0)
+    bench.add_argument("--int8", action="store_true")
+    bench.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if args.command == "export":
+        for path in export_easyocr_to_onnx(quantize=args.int8):
+            print(path)
+    else:
+        report = benchmark(args.images, threads=args.threads, quantized=args.int8, repeat=args.repeat)
+        for key, value in report.items():
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,18 @@
 import logging
 import re
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from difflib import SequenceMatcher
 from rapidfuzz import fuzz, process
 import cv2
 
 import numpy as np
-from PIL import Image, ImageGrab, ImageQt, ImageDraw, ImageFont
-from PySide6.QtGui import QGuiApplication
+from PIL import Image, ImageGrab
+from PySide6.QtGui import QGuiApplication, QImage
 from PySide6.QtWidgets import QMessageBox
+from PySide6.QtCore import QTimer, Qt, Slot
 try:
     from PySide6.QtCore import QDate, QTime
 except Exception:
@@ -25,19 +28,93 @@ import json
 from pathlib import Path
 
 from constants import rooms_by_bz
+from logic.aho_corasick import AhoCorasick
 from logic.app_state import UIContext
-from logic.utils import run_in_thread
+from logic.ocr_cache import OcrCache, image_hash
+from logic.ocr_debug import (
+    DEBUG_ALWAYS,
+    DEBUG_OFF,
+    DEBUG_ON_FAILURE,
+    debug_writer,
+)
+from logic.ocr_engines import DEFAULT_ENGINE, OcrEngine
+from logic.ocr_layout import Layout, add_geometry, box_rect, group_rows, near_anchor
+from logic.ocr_preprocess import (
+    as_rgb_array,
+    choose_scale,
+    estimate_glyph_height,
+    find_event_card,
+    resize_interpolation,
+)
+from logic.ocr_registry import ReaderRegistry, process_rss
+from logic.ocr_templates import LayoutTemplates, template_key
+from logic.ocr_tiles import TILE_MIN_PIXELS, read_tiled, shutdown_tile_pool
+from logic.utils import call_in_gui, run_in_thread
 
 
 # --- OCR конфигурация ---
 SCORE_IGNORE_THRESHOLD = 0.7
 SCORE_THRESHOLD = 0.82
 FUZZY_THRESHOLD = 0.75
+# Порог сопоставления БЦ и переговорки при автозаполнении (мягче FUZZY_THRESHOLD)
+ROOM_FUZZY_THRESHOLD = 0.6
+# Сходство строки с названием БЦ из справочника (0–100), чтобы не принять его за переговорку
+BZ_NAME_SIMILARITY = 80
+# Минимальная доля общих слов для сопоставления переговорки по токенам
+ROOM_TOKEN_THRESHOLD = 0.4
 BBOX_Y_TOLERANCE = 25
 SPLIT_TOKEN_MAX_GAP = 70
 FORCE_FUZZY = True
-
-# Checkbox конфигурация
+LABEL_SIMILARITY = 70
+
+# Словарь меток карточки встречи для классификации строк OCR
+LABEL_VOCAB = [
+    "организатор",
+    "участники",
+    "время",
+    "время и дата",
+    "дата",
+    "дата и время",
+    "переговорка",
+    "место",
+    "адрес",
+    "бц",
+]
+_TIME_LABELS = {"время", "время и дата", "дата и время"}
+_DATE_RE = re.compile(r"\d{2}\.\d{2}\.\d{2,4}")
+CROP_EVENT_CARD = True
+ADAPTIVE_SCALE = True
+
+# Повторное распознавание неуверенных строк, из которых взяты поля
+REFINE_LOW_SCORES = True
+REFINE_SCALE = 3.0
+REFINE_PADDING = 4
+DIGIT_ALLOWLIST = "0123456789:.-–"
+_DIGIT_FIELDS = {"start", "end", "date", "time"}
+
+# Двухэтапный режим: поиск рамок, затем распознавание только рядом с метками
+TWO_STAGE_OCR = False
+# Рамки не длиннее этого отношения ширины к высоте читаются в быстром проходе
+ANCHOR_MAX_ASPECT = 10
+
+# Очень большие кадры распознаются по плиткам в отдельных процессах
+TILED_OCR = True
+
+# Выученные шаблоны раскладки: проверка меток и чтение только областей значений
+USE_LAYOUT_TEMPLATES = True
+TEMPLATE_VERIFY_ANCHORS = 2
+TEMPLATE_PADDING = 6
+
+# Число постоянных процессов OCR (0 — распознавание в текущем процессе)
+OCR_WORKERS = 0
+
+# Пауза после копирования скриншота перед упреждающим распознаванием, мс
+CLIPBOARD_DEBOUNCE_MS = 400
+
+# Как часто проверять простой модели OCR для выгрузки, мс
+OCR_IDLE_CHECK_INTERVAL = 60 * 1000
+
+# Checkbox конфигурация (в пикселях изображения, увеличенного в 2 раза)
 CHECKBOX_X_OFFSET = 55
 CHECKBOX_SIZE = 37
 CHECKBOX_THRESHOLD = 170
@@ -49,29 +126,246 @@ logging.basicConfig(
 )
 
 
+_readers = ReaderRegistry()
+
+# Состояние модели: "idle" — не загружена, "loading" — загружается, "ready" — готова
+_ocr_state = "idle"
+
 
-from typing import Any
+def _init_ocr(
+    use_gpu: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    options: dict | None = None,
+) -> OcrEngine:
+    """Вернуть прогретый движок из реестра, загрузив его при необходимости."""
+    global _ocr_state
+    options = options or {}
+    if not _readers.has(engine, use_gpu, options):
+        _ocr_state = "loading"
+    try:
+        reader = _readers.get(engine, use_gpu, options)
+    except Exception as e:
+        logging.error("[OCR] Failed to initialize %s: %s", engine, e)
+        _ocr_state = "ready" if len(_readers) else "idle"
+        raise
+    _ocr_state = "ready"
+    return reader
 
-_ocr_instance: Any = None
 
+def ocr_reader_stats() -> List[Dict]:
+    """Вернуть загруженные экземпляры OCR с временем загрузки и памятью."""
+    return _readers.stats()
 
-_ocr_gpu = False
 
+def engine_options(ctx: UIContext) -> dict:
+    """Собрать параметры выбранного движка OCR из настроек."""
+    if ctx.ocr_engine == "EasyOCR-ONNX":
+        return {"threads": ctx.ocr_onnx_threads, "quantized": ctx.ocr_onnx_int8}
+    return {}
 
-def _init_ocr(use_gpu: bool = False):
-    global _ocr_instance, _ocr_gpu
-    if _ocr_instance is None or _ocr_gpu != use_gpu:
-        logging.debug("[OCR] Initializing EasyOCR (GPU=%s)", use_gpu)
-        try:
-            import easyocr
-        except Exception as e:
-            logging.error("[OCR] Failed to import EasyOCR: %s", e)
-            raise
-        _ocr_instance = easyocr.Reader(['ru', 'en'], gpu=use_gpu)
-        _ocr_gpu = use_gpu
-        logging.debug("[OCR] EasyOCR successfully initialized")
 
-    return _ocr_instance
+def ocr_state() -> str:
+    """Вернуть состояние модели OCR: ``idle``, ``loading`` или ``ready``."""
+    return _ocr_state
+
+
+def warm_up_ocr(ctx: UIContext) -> None:
+    """Загрузить модель OCR в фоне и прогнать пробное распознавание.
+
+    При ``ctx.ocr_workers`` модель загружается в постоянных процессах OCR:
+    они запускаются в фоне, а готовность отмечается после пробного
+    распознавания в одном из них.
+    """
+    global _ocr_state
+    use_gpu = ctx.ocr_mode == "GPU"
+    engine = ctx.ocr_engine
+    options = engine_options(ctx)
+    if ctx.ocr_workers:
+        configure_ocr_cache(ctx.ocr_cache_enabled, ctx.ocr_cache_persist)
+    if _ocr_state != "idle":
+        return
+    _ocr_state = "loading"
+    _set_autofill_status(ctx)
+    blank = np.full((32, 96, 3), 255, dtype=np.uint8)
+
+    def task():
+        start = time.perf_counter()
+        if ctx.ocr_workers:
+            from logic.ocr_worker import get_worker_pool
+
+            pool = get_worker_pool(ctx.ocr_workers, engine, use_gpu, options, _worker_templates())
+            pool.start()
+            pool.run(blank, {})
+        else:
+            reader = _init_ocr(use_gpu, engine, options)
+            reader.readtext(blank)
+        return time.perf_counter() - start
+
+    @Slot(object)
+    def on_done(result_error):
+        global _ocr_state
+        elapsed, error = result_error
+        if error:
+            logging.error("[OCR] Warm-up failed: %s", error)
+            _ocr_state = "idle"
+        else:
+            logging.info("[OCR] Warm-up finished in %.2fs", elapsed)
+            _ocr_state = "ready"
+        if _current_job is None:
+            _set_autofill_status(ctx)
+
+    run_in_thread(task, on_done)
+
+
+def configure_ocr_unload(idle_minutes: int) -> None:
+    """Задать простой в минутах, после которого модель выгружается (0 — никогда)."""
+    _readers.idle_timeout = idle_minutes * 60 if idle_minutes > 0 else None
+
+
+def unload_idle_ocr(ctx: UIContext) -> None:
+    """Выгрузить простаивающие модели OCR и освободить память.
+
+    Останавливаются и простаивающие процессы OCR со своими копиями модели.
+    Во время распознавания (в том числе заранее начатого по буферу обмена)
+    или загрузки ничего не выгружается.
+    """
+    global _ocr_state
+    if _current_job is not None or _ocr_state == "loading":
+        return
+    if _speculative is not None and _speculative.result is None:
+        return
+    configure_ocr_unload(ctx.ocr_idle_unload)
+    from logic.ocr_worker import stop_idle_workers
+
+    workers_stopped = _readers.idle_timeout is not None and stop_idle_workers(_readers.idle_timeout)
+    if not (_readers.evict() or workers_stopped) or len(_readers):
+        return
+    # Процессы плиток держат собственные копии модели
+    shutdown_tile_pool()
+    _ocr_state = "idle"
+    logging.info("[OCR] Model unloaded after idle, process RSS %.0f MB", process_rss() / 2**20)
+    _set_autofill_status(ctx)
+
+
+def ocr_memory_usage() -> Dict[str, float]:
+    """Вернуть число загруженных моделей, их память, память процесса
+    и число запущенных процессов OCR с их общей памятью в МБ."""
+    from logic.ocr_worker import worker_memory
+
+    workers, workers_mb = worker_memory()
+    return {
+        "models": len(_readers),
+        "models_mb": round(_readers.memory_mb(), 1),
+        "process_mb": round(process_rss() / 2**20, 1),
+        "workers": workers,
+        "workers_mb": workers_mb,
+    }
+
+
+def start_ocr_memory_manager(ctx: UIContext) -> None:
+    """Запустить выгрузку модели по простою и фоновую подгрузку.
+
+    При включённом ``ctx.ocr_preload`` выгруженная модель загружается снова,
+    когда окно получает фокус или в буфер обмена копируется изображение.
+    """
+    configure_ocr_unload(ctx.ocr_idle_unload)
+    timer = QTimer(ctx.window)
+    timer.setInterval(OCR_IDLE_CHECK_INTERVAL)
+    timer.timeout.connect(lambda: unload_idle_ocr(ctx))
+    timer.start()
+    ctx.ocr_unload_timer = timer
+
+    def preload() -> None:
+        if ctx.ocr_preload and _current_job is None:
+            warm_up_ocr(ctx)
+
+    def on_state_changed(state) -> None:
+        if state == Qt.ApplicationState.ApplicationActive:
+            preload()
+
+    def on_clipboard_changed() -> None:
+        mime = QGuiApplication.clipboard().mimeData()
+        if mime is not None and mime.hasImage():
+            preload()
+
+    app = QGuiApplication.instance()
+    if app is not None:
+        app.applicationStateChanged.connect(on_state_changed)
+        QGuiApplication.clipboard().dataChanged.connect(on_clipboard_changed)
+
+
+class OcrCancelled(Exception):
+    """Задача распознавания была отменена пользователем."""
+
+
+class OcrJob:
+    """Фоновая задача распознавания с отчётом о прогрессе и отменой."""
+
+    def __init__(self, on_progress: Callable[[str, int], None] | None = None):
+        self.cancelled = False
+        self._on_progress = on_progress
+
+    def cancel(self) -> None:
+        """Пометить задачу как отменённую."""
+        self.cancelled = True
+
+    def check(self) -> None:
+        """Прервать выполнение, если задача отменена."""
+        if self.cancelled:
+            raise OcrCancelled()
+
+    def report(self, stage: str, percent: int) -> None:
+        """Сообщить о переходе к новому этапу в главный поток."""
+        self.check()
+        logging.debug("[OCR] Stage '%s' (%d%%)", stage, percent)
+        if self._on_progress:
+            callback = self._on_progress
+            call_in_gui(lambda: None if self.cancelled else callback(stage, percent))
+
+
+def _report(job: OcrJob | None, stage: str, percent: int) -> None:
+    if job is not None:
+        job.report(stage, percent)
+
+
+_AUTOFILL_TEXT = "Автозаполнение полей"
+_current_job: OcrJob | None = None
+
+OCR_CACHE_PATH = Path(__file__).resolve().parent.parent / "ocr_cache.json"
+_ocr_cache: OcrCache | None = OcrCache()
+_ocr_cache_persist = False
+
+LAYOUT_TEMPLATES_PATH = Path(__file__).resolve().parent.parent / "ocr_templates.json"
+_layout_templates: LayoutTemplates | None = LayoutTemplates()
+
+
+def configure_ocr_cache(enabled: bool = True, persist: bool = False) -> None:
+    """Включить или выключить кеш результатов OCR и его хранение на диске.
+
+    Выученные шаблоны раскладки следуют тем же настройкам.
+    """
+    global _ocr_cache, _ocr_cache_persist, _layout_templates
+    if not enabled:
+        _ocr_cache = None
+        _layout_templates = None
+        return
+    if _ocr_cache is None or _ocr_cache_persist != persist:
+        _ocr_cache = OcrCache(path=OCR_CACHE_PATH if persist else None)
+        _layout_templates = LayoutTemplates(path=LAYOUT_TEMPLATES_PATH if persist else None)
+        _ocr_cache_persist = persist
+
+
+def _worker_templates() -> Tuple[bool, bool]:
+    """Вернуть настройки шаблонов раскладки для процессов OCR."""
+    enabled = _layout_templates is not None
+    return enabled, enabled and _ocr_cache_persist
+
+
+def ocr_cache_stats() -> Dict[str, int]:
+    """Вернуть статистику кеша OCR."""
+    if _ocr_cache is None:
+        return {"size": 0, "hits": 0, "misses": 0}
+    return _ocr_cache.stats()
 
 
 def normalize_russian(text: str) -> str:
@@ -102,6 +396,17 @@ def normalize_generic(text: str) -> str:
     return text.lower().strip()
 
 
+_BZ_NAMES = [normalize_generic(bz) for bz in rooms_by_bz]
+
+
+def _is_bz_name(norm: str) -> bool:
+    """Похожа ли строка на название БЦ: с «бц» или из справочника без него."""
+    if "бц" in norm:
+        return True
+    match = process.extractOne(norm, _BZ_NAMES, scorer=fuzz.ratio, processor=None)
+    return match is not None and match[1] >= BZ_NAME_SIMILARITY
+
+
 def fix_ocr_time_garbage(text: str) -> str:
     """Исправить типичные ошибки распознавания времени."""
     return (
@@ -130,42 +435,77 @@ def normalize_time(text: str) -> str | None:
 
 
 
-def get_image_from_clipboard() -> Optional[Image.Image]:
-    """Получить изображение из буфера обмена или ``None``."""
+class _QImageBuffer:
+    """Память QImage для ``np.asarray``: массив держит ссылку на изображение."""
+
+    def __init__(self, qimg: QImage) -> None:
+        self._qimg = qimg
+        bits = np.frombuffer(qimg.constBits(), dtype=np.uint8)
+        self.__array_interface__ = {
+            "version": 3,
+            "shape": (qimg.height(), qimg.width(), 3),
+            "typestr": "|u1",
+            "strides": (qimg.bytesPerLine(), 3, 1),
+            "data": (bits.ctypes.data, True),
+        }
+
+
+def qimage_to_array(qimg: QImage) -> np.ndarray:
+    """Вернуть QImage как массив RGB ``(h, w, 3)`` только для чтения.
+
+    Изображение в формате RGB888 не копируется: массив смотрит в его
+    память с учётом шага строки. Остальные форматы один раз переводятся
+    в RGB888 средствами Qt.
+    """
+    if qimg.format() != QImage.Format.Format_RGB888:
+        qimg = qimg.convertToFormat(QImage.Format.Format_RGB888)
+    return np.asarray(_QImageBuffer(qimg))
+
+
+def get_image_from_clipboard() -> Optional[np.ndarray]:
+    """Получить изображение из буфера обмена как массив RGB или ``None``.
+
+    Изображение Qt передаётся без копирования (см. ``qimage_to_array``),
+    ``ImageGrab`` используется, только если Qt изображения не отдал.
+    """
+    qimg = QGuiApplication.clipboard().image()
+    if not qimg.isNull():
+        return qimage_to_array(qimg)
     try:
         img = ImageGrab.grabclipboard()
     except Exception as e:
         logging.error("[OCR] Failed to grab from clipboard: %s", e)
-        img = None
-
-    if isinstance(img, list) or img is None:
-        qimg = QGuiApplication.clipboard().image()
-        if qimg.isNull():
-            return None
-        return ImageQt.fromqimage(qimg).convert("RGB")
+        return None
     if isinstance(img, Image.Image):
-        return img.convert("RGB")
+        return as_rgb_array(img)
     return None
 
 
-def run_ocr(
-    image: Image.Image,
-    *,
-    ignore_threshold: float = SCORE_IGNORE_THRESHOLD,
-    use_gpu: bool = False,
-) -> Tuple[List[Dict], str]:
-    """Распознать текст на изображении при помощи EasyOCR."""
+# Данные последнего распознавания в текущем потоке для отладочной записи
+_debug_local = threading.local()
 
-    reader = _init_ocr(use_gpu)
-    image = image.resize((image.width * 2, image.height * 2), Image.LANCZOS)
-    result = reader.readtext(np.array(image))
+_CARD_ANCHORS = ("организатор", "переговорка", "повторять", "время", "дата")
 
+
+def _read_lines(
+    reader: OcrEngine,
+    image: np.ndarray,
+    offset: Tuple[int, int],
+    ignore_threshold: float,
+) -> List[Dict]:
+    """Распознать изображение и перевести рамки в координаты всего кадра."""
+    return _to_lines(reader.readtext(np.ascontiguousarray(image)), offset, ignore_threshold)
+
+
+def _to_lines(results: list, offset: Tuple[int, int], ignore_threshold: float) -> List[Dict]:
+    """Перевести результат движка в строки OCR с рамками в координатах кадра."""
+    ox, oy = offset
     lines: List[Dict] = []
-    for bbox, text, score in result:
+    for bbox, text, score in results:
         low_score = score < ignore_threshold
         if low_score:
             logging.warning("[OCR] Low confidence %.2f for text '%s'", score, text)
-        bbox_int = [[int(x), int(y)] for x, y in bbox]
+        bbox_int = [[int(x) + ox, int(y) + oy] for x, y in bbox]
         lines.append({
             "text": text.strip(),
             "score": float(score),
@@ -173,173 +513,873 @@ def run_ocr(
             "raw_text": text.strip(),
             "low_score": low_score,
         })
+    return lines
+
+
+def _upscale(image: np.ndarray, scale: float) -> np.ndarray:
+    """Увеличить изображение в ``scale`` раз подходящим фильтром."""
+    if scale == 1:
+        return image
+    h, w = image.shape[:2]
+    size = (round(w * scale), round(h * scale))
+    return cv2.resize(image, size, interpolation=resize_interpolation(scale))
+
+
+def _crop(image: np.ndarray, box: Tuple[int, int, int, int]) -> np.ndarray:
+    """Вернуть область ``(x1, y1, x2, y2)`` изображения без копирования."""
+    x1, y1, x2, y2 = box
+    return image[y1:y2, x1:x2]
+
+
+def _is_card_anchor(text: str) -> bool:
+    norm = normalize_russian(text.lower())
+    return any(anchor in norm for anchor in _CARD_ANCHORS)
+
+
+def _is_checkbox_anchor(text: str) -> bool:
+    """Строка ряда «Повторять»/«Весь день», по которой определяется тип встречи."""
+    norm = normalize_russian(text.lower())
+    return "повторять" in norm or ("весь" in norm and "день" in norm)
+
+
+def _has_card_anchor(lines: List[Dict]) -> bool:
+    """Проверить, что среди строк есть хотя бы одна метка карточки встречи."""
+    return any(_is_card_anchor(line["text"]) for line in lines)
+
+
+def _reading_order(results: list) -> list:
+    """Упорядочить результаты движка по рядам сверху вниз и слева направо.
+
+    Последовательный парсер ожидает порядок чтения, как у ``readtext``.
+    """
+    items = [add_geometry({"bbox": r[0], "result": r}) for r in results]
+    return [item["result"] for row in group_rows(items, BBOX_Y_TOLERANCE) for item in row]
+
+
+def _read_lines_two_stage(
+    reader: OcrEngine,
+    image: np.ndarray,
+    offset: Tuple[int, int],
+    ignore_threshold: float,
+) -> List[Dict]:
+    """Найти рамки и распознать только метки и значения рядом с ними.
 
-    meeting_type, rep_bbox, cb_bbox = detect_repeat_checkbox(image, lines)
-    save_debug_ocr_image(
-        image,
-        lines,
-        repeat_bbox=rep_bbox,
-        checkbox_bbox=cb_bbox,
-        checkbox_checked=meeting_type == "Регулярная",
+    Сначала читаются короткие рамки — среди них метки карточки. Длинные
+    рамки (списки участников, описание) распознаются, только если стоят
+    справа от метки или под ней. Если меток нет, читается всё.
+    """
+    arr = np.ascontiguousarray(image)
+    boxes = reader.detect(arr)
+    rects = [box_rect(box) for box in boxes]
+    quick = [
+        i for i, (x1, y1, x2, y2) in enumerate(rects)
+        if x2 - x1 <= ANCHOR_MAX_ASPECT * max(1, y2 - y1)
+    ]
+    results = list(reader.recognize_boxes(arr, [boxes[i] for i in quick]))
+    anchors = [box_rect(bbox) for bbox, text, _ in results if _is_card_anchor(text)]
+    done = set(quick)
+    rest = [
+        i for i in range(len(boxes))
+        if i not in done and (not anchors or any(near_anchor(rects[i], a) for a in anchors))
+    ]
+    results.extend(reader.recognize_boxes(arr, [boxes[i] for i in rest]))
+    results = _reading_order(results)
+    logging.debug(
+        "[OCR] Two-stage: %d boxes, %d anchors, %d recognized",
+        len(boxes),
+        len(anchors),
+        len(quick) + len(rest),
     )
-    return lines, meeting_type
+    return _to_lines(results, offset, ignore_threshold)
+
 
-def extract_fields_from_text(texts, rooms_by_bz):
-    """Выделить основные поля из списка строк OCR."""
-    name = ""
-    bz = ""
-    room = ""
-    start_time = ""
-    end_time = ""
-    date = ""
-
-    # 1. Имя организатора (ищем рядом со словом "Организатор")
-    for i, txt in enumerate(texts):
-        if "организатор" in txt.lower() and i + 1 < len(texts):
-            full_name = texts[i + 1]
-            name = full_name.split()[0]
-
-    # 2. Дата и время
-    found_times = []
-    for txt in texts:
-        cleaned = re.sub(r"[^\d]", ":", txt.strip())
-        if re.fullmatch(r"\d{2}:\d{2}", cleaned):
-            found_times.append(cleaned)
-            if len(found_times) == 2:
+def _refine_lines(
+    reader: OcrEngine,
+    image: np.ndarray,
+    lines: List[Dict],
+    scale: float,
+    ignore_threshold: float,
+    job: OcrJob | None = None,
+) -> List[Dict]:
+    """Перераспознать неуверенные строки, из которых разбор взял поля.
+
+    Фрагмент исходного изображения под рамкой строки увеличивается сильнее
+    обычного; для времени и даты набор символов ограничен цифрами.
+    Строка заменяется, только если новая уверенность выше прежней.
+    """
+    sources: Dict[str, List[Dict]] = {}
+    parse_fields_layout(lines, sources=sources)
+    targets: Dict[Tuple[int, int, int, int], str | None] = {}
+    for key, values in sources.items():
+        for val in values:
+            if val["score"] >= SCORE_THRESHOLD:
+                continue
+            rect = box_rect(val["bbox"])
+            allowlist = DIGIT_ALLOWLIST if key in _DIGIT_FIELDS else None
+            # Строка с временем и названием не должна терять буквы
+            if rect in targets and targets[rect] != allowlist:
+                allowlist = None
+            targets[rect] = allowlist
+    if not targets:
+        return lines
+
+    refine_scale = max(REFINE_SCALE, scale + 1)
+    height, width = image.shape[:2]
+    for (x1, y1, x2, y2), allowlist in targets.items():
+        if job is not None:
+            job.check()
+        box = (
+            max(int(x1 / scale) - REFINE_PADDING, 0),
+            max(int(y1 / scale) - REFINE_PADDING, 0),
+            min(int(x2 / scale) + REFINE_PADDING + 1, width),
+            min(int(y2 / scale) + REFINE_PADDING + 1, height),
+        )
+        crop = _upscale(_crop(image, box), refine_scale)
+        result = reader.recognize(np.ascontiguousarray(crop), allowlist=allowlist)
+        text = " ".join(t.strip() for _, t, _ in result if t.strip())
+        if not text:
+            continue
+        score = min(float(sc) for _, t, sc in result if t.strip())
+        inside = [
+            l for l in lines
+            if x1 <= sum(p[0] for p in l["bbox"]) / 4 <= x2
+            and y1 <= sum(p[1] for p in l["bbox"]) / 4 <= y2
+        ]
+        if not inside:
+            continue
+        old_score = min(l["score"] for l in inside)
+        old_text = " ".join(l["text"] for l in inside)
+        if score <= old_score:
+            logging.debug(
+                "[OCR] Refine kept '%s' (%.2f), got '%s' (%.2f)", old_text, old_score, text, score
+            )
+            continue
+        logging.debug(
+            "[OCR] Refined '%s' (%.2f) -> '%s' (%.2f)", old_text, old_score, text, score
+        )
+        # Новая строка встаёт на место первой заменённой, чтобы не нарушить порядок чтения
+        replaced = {id(l) for l in inside}
+        index = next(i for i, l in enumerate(lines) if id(l) in replaced)
+        lines = [l for l in lines if id(l) not in replaced]
+        lines.insert(index, {
+            "text": text,
+            "score": score,
+            "bbox": [[x1, y1], [x2, y1], [x2, y2], [x1, y2]],
+            "raw_text": text,
+            "low_score": score < ignore_threshold,
+        })
+    return lines
+
+
+def _rect_1x(bbox: List[List[int]], scale: float) -> List[int]:
+    """Перевести рамку из координат увеличенного кадра в пиксели скриншота."""
+    x1, y1, x2, y2 = box_rect(bbox)
+    return [int(x1 / scale), int(y1 / scale), int(-(-x2 // scale)), int(-(-y2 // scale))]
+
+
+def _learn_template(key: str, lines: List[Dict], scale: float) -> None:
+    """Запомнить раскладку удачно разобранного скриншота.
+
+    Якорями служат метки карточки и строки ряда флажка, областями значений —
+    ряды со строками, из которых разбор взял поля; область ряда тянется до
+    правого края текста. Без ряда флажка шаблон не запоминается: тип
+    встречи по нему не проверить.
+    """
+    if _layout_templates is None:
+        return
+    sources: Dict[str, List[Dict]] = {}
+    parse_fields_layout(lines, sources=sources)
+    anchors = [
+        {"text": l["text"], "rect": _rect_1x(l["bbox"], scale)}
+        for l in lines
+        if _is_card_anchor(l["text"]) or _is_checkbox_anchor(l["text"])
+    ]
+    values = [(key_, val) for key_, vals in sources.items() if key_ != "time" for val in vals]
+    if len(anchors) < TEMPLATE_VERIFY_ANCHORS or not values:
+        return
+    if not any(_is_checkbox_anchor(a["text"]) for a in anchors):
+        return
+    right = max(_rect_1x(l["bbox"], scale)[2] for l in lines)
+    rows: List[Dict] = []
+    for field, val in values:
+        x1, y1, _, y2 = _rect_1x(val["bbox"], scale)
+        digits = field in _DIGIT_FIELDS
+        for row in rows:
+            rx1, ry1, rx2, ry2 = row["rect"]
+            if y1 < ry2 and y2 > ry1:
+                row["rect"] = [min(rx1, x1), min(ry1, y1), rx2, max(ry2, y2)]
+                row["digits"] = row["digits"] and digits
                 break
-    if len(found_times) == 2:
-        start_time, end_time = found_times
+        else:
+            rows.append({"rect": [x1, y1, right, y2], "digits": digits})
+    regions = [
+        {"rect": row["rect"], "allowlist": DIGIT_ALLOWLIST if row["digits"] else None}
+        for row in rows
+    ]
+    # Справа от «Весь день» может стоять «Повторять»: этот ряд перечитывается целиком
+    for anchor in anchors:
+        norm = normalize_russian(anchor["text"].lower())
+        if "весь" in norm and "день" in norm:
+            _, y1, x2, y2 = anchor["rect"]
+            if x2 < right:
+                regions.append({"rect": [x2, y1, right, y2], "allowlist": None})
+    _layout_templates.learn(key, scale, anchors, regions)
+
+
+def _read_from_template(
+    reader: OcrEngine,
+    image: np.ndarray,
+    key: str,
+    ignore_threshold: float,
+    job: OcrJob | None = None,
+) -> Tuple[List[Dict], List[Dict], float] | None:
+    """Распознать скриншот по выученному шаблону раскладки.
+
+    Сначала перечитываются самые длинные метки-якоря и все строки ряда
+    флажка, по которым определяется тип встречи; если хоть одна не
+    совпала, шаблон забывается, возвращается ``None`` и используется полный
+    конвейер, который выучит раскладку заново.
+    Возвращает строки в координатах увеличенного кадра, те же строки в
+    пикселях скриншота и масштаб шаблона.
+    """
+    template = _layout_templates.get(key) if _layout_templates is not None else None
+    if template is None:
+        return None
+    scale = template["scale"]
+    height, width = image.shape[:2]
+
+    def read(rect: List[int], allowlist: str | None = None) -> Tuple[str, float]:
+        x1, y1, x2, y2 = rect
+        box = (
+            max(x1 - TEMPLATE_PADDING, 0),
+            max(y1 - TEMPLATE_PADDING, 0),
+            min(x2 + TEMPLATE_PADDING, width),
+            min(y2 + TEMPLATE_PADDING, height),
+        )
+        crop = np.ascontiguousarray(_upscale(_crop(image, box), scale))
+        parts = [
+            (t.strip(), float(sc))
+            for _, t, sc in reader.recognize(crop, allowlist=allowlist)
+            if t.strip()
+        ]
+        return " ".join(t for t, _ in parts), min((sc for _, sc in parts), default=0.0)
+
+    anchors = template["anchors"]
+    checkbox = [a for a in anchors if _is_checkbox_anchor(a["text"])]
+    if not checkbox:
+        # Шаблон старого формата без ряда флажка: тип встречи по нему не проверить
+        _layout_templates.record(False)
+        _layout_templates.forget(key)
+        return None
+    longest = sorted(anchors, key=lambda a: -len(a["text"]))[:TEMPLATE_VERIFY_ANCHORS]
+    for anchor in longest + [a for a in checkbox if a not in longest]:
+        text, _ = read(anchor["rect"])
+        similarity = fuzz.ratio(
+            normalize_russian(text.lower()), normalize_russian(anchor["text"].lower())
+        )
+        if similarity <= LABEL_SIMILARITY:
+            logging.debug(
+                "[OCR] Layout template %s rejected: '%s' vs '%s'", key, text, anchor["text"]
+            )
+            _layout_templates.record(False)
+            _layout_templates.forget(key)
+            return None
 
-    for txt in texts:
-        if re.fullmatch(r"\d{2}\.\d{2}\.\d{4}", txt.strip()):
-            date = txt.strip()
-            break
+    results = [(anchor["rect"], anchor["text"], 1.0) for anchor in anchors]
+    for region in template["regions"]:
+        if job is not None:
+            job.check()
+        text, score = read(region["rect"], region["allowlist"])
+        if text:
+            results.append((region["rect"], text, score))
+    _layout_templates.record(True)
+    logging.debug("[OCR] Layout template %s hit, %d regions", key, len(template["regions"]))
+
+    def bbox(rect: List[int], k: float) -> List[List[float]]:
+        x1, y1, x2, y2 = (v * k for v in rect)
+        return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+    lines_1x = _to_lines([(bbox(r, 1), t, sc) for r, t, sc in results], (0, 0), ignore_threshold)
+    lines = _to_lines([(bbox(r, scale), t, sc) for r, t, sc in results], (0, 0), ignore_threshold)
+    return lines, lines_1x, scale
+
+
+def _run_ocr_remote(
+    image: np.ndarray,
+    workers: int,
+    *,
+    engine: str,
+    use_gpu: bool,
+    engine_options: dict | None,
+    kwargs: Dict,
+    job: OcrJob | None,
+) -> Tuple[List[Dict], str]:
+    """Распознать изображение в пуле постоянных процессов OCR."""
+    from logic.ocr_worker import get_worker_pool
+
+    pool = get_worker_pool(workers, engine, use_gpu, engine_options, _worker_templates())
+    result, worker, request_id = pool.run(image, kwargs, job)
+    # Шаблон и отладочная запись остаются в процессе, который распознавал
+    _debug_local.remote = (worker, request_id)
+    return result
+
+
+def run_ocr(
+    image: Image.Image | np.ndarray,
+    *,
+    ignore_threshold: float = SCORE_IGNORE_THRESHOLD,
+    use_gpu: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    engine_options: dict | None = None,
+    use_cache: bool = True,
+    debug_mode: str = DEBUG_OFF,
+    scale: float | None = None,
+    two_stage: bool | None = None,
+    use_templates: bool = True,
+    workers: int | None = None,
+    job: OcrJob | None = None,
+) -> Tuple[List[Dict], str]:
+    """Распознать текст на изображении выбранным движком OCR.
+
+    Повторное распознавание того же изображения берётся из кеша. На
+    больших скриншотах распознаётся только карточка встречи, рамки строк
+    при этом возвращаются в координатах всего увеличенного кадра; кадры
+    больше ``TILE_MIN_PIXELS`` распознаются по плиткам параллельно.
+    Отладочные изображения пишутся в фоне в зависимости от ``debug_mode``.
+    ``scale`` фиксирует коэффициент увеличения вместо автоматического,
+    ``two_stage`` включает распознавание только рядом с метками
+    (по умолчанию ``TWO_STAGE_OCR``). При ``use_templates`` скриншот
+    знакомого размера сначала читается по выученному шаблону раскладки.
+    При ``workers`` (по умолчанию ``OCR_WORKERS``) распознавание идёт в
+    отдельном процессе, изображение передаётся через общую память.
+    Изображение — PIL или массив RGB; один и тот же массив (без копий)
+    используется для хеша, обрезки, увеличения, чекбокса и отладки.
+    """
+
+    _debug_local.capture = None
+    _debug_local.remote = None
+    image = as_rgb_array(image)
+    two_stage = TWO_STAGE_OCR if two_stage is None else two_stage
+    cache = _ocr_cache if use_cache else None
+    cache_key = ""
+    if cache is not None:
+        mode = "two_stage" if two_stage else "full"
+        cache_key = f"{engine}:{scale or 'auto'}:{mode}:{image_hash(image)}"
+        cached = cache.get(cache_key)
+        logging.debug("[OCR] Cache stats: %s", cache.stats())
+        if cached is not None:
+            logging.debug("[OCR] Cache hit for %s", cache_key)
+            return cached
+
+    workers = OCR_WORKERS if workers is None else workers
+    if workers:
+        lines, meeting_type = _run_ocr_remote(
+            image,
+            workers,
+            engine=engine,
+            use_gpu=use_gpu,
+            engine_options=engine_options,
+            kwargs={
+                "ignore_threshold": ignore_threshold,
+                "debug_mode": debug_mode,
+                "scale": scale,
+                "two_stage": two_stage,
+                "use_templates": use_templates,
+            },
+            job=job,
+        )
+        if cache is not None:
+            cache.put(cache_key, lines, meeting_type)
+        return lines, meeting_type
+
+    _report(job, "Загрузка модели", 5)
+    reader = _init_ocr(use_gpu, engine, engine_options)
+    layout_key = template_key((image.shape[1], image.shape[0]), scale)
+    if USE_LAYOUT_TEMPLATES and use_templates:
+        _report(job, "Проверка шаблона", 10)
+        hit = _read_from_template(reader, image, layout_key, ignore_threshold, job)
+        if hit is not None:
+            lines, lines_1x, template_scale = hit
+            meeting_type, rep_bbox, cb_bbox = detect_repeat_checkbox(
+                image, lines_1x, scale=1.0
+            )
+            _debug_local.capture = {
+                "image": image,
+                "lines": lines_1x,
+                "offset": (0, 0),
+                "meta": {"scale": 1.0, "template": layout_key, "template_scale": template_scale},
+                "repeat_bbox": rep_bbox,
+                "checkbox_bbox": cb_bbox,
+                "checkbox_checked": meeting_type == "Регулярная",
+            }
+            if debug_mode == DEBUG_ALWAYS:
+                debug_writer.submit(_debug_local.capture)
+            if cache is not None:
+                cache.put(cache_key, lines, meeting_type)
+            return lines, meeting_type
+
+    def read(img: np.ndarray, off: Tuple[int, int]) -> List[Dict]:
+        if TILED_OCR and img.shape[0] * img.shape[1] > TILE_MIN_PIXELS:
+            results = read_tiled(
+                img,
+                reader,
+                engine=engine,
+                use_gpu=use_gpu,
+                options=engine_options or {},
+                y_tolerance=BBOX_Y_TOLERANCE,
+            )
+            return _to_lines(_reading_order(results), off, ignore_threshold)
+        if two_stage and reader.can_detect:
+            return _read_lines_two_stage(reader, img, off, ignore_threshold)
+        return _read_lines(reader, img, off, ignore_threshold)
+
+    _report(job, "Подготовка изображения", 15)
+    card = find_event_card(image) if CROP_EVENT_CARD else None
+    source = _crop(image, (card[0], card[1], card[0] + card[2], card[1] + card[3])) if card else image
+    glyph_height = None
+    if scale is None:
+        glyph_height = estimate_glyph_height(source) if ADAPTIVE_SCALE else None
+        scale = choose_scale(glyph_height)
+    logging.debug("[OCR] Glyph height %s px -> scale %.1f", glyph_height, scale)
+    offset = (round(card[0] * scale), round(card[1] * scale)) if card else (0, 0)
+    scaled = _upscale(source, scale)
+    _report(job, "Распознавание текста", 25)
+    lines = read(scaled, offset)
+
+    if card and not _has_card_anchor(lines):
+        logging.debug("[OCR] No labels found in card crop, retrying on full image")
+        offset = (0, 0)
+        scaled = _upscale(image, scale)
+        _report(job, "Распознавание текста", 45)
+        lines = read(scaled, offset)
+    if REFINE_LOW_SCORES:
+        _report(job, "Уточнение строк", 60)
+        lines = _refine_lines(reader, image, lines, scale, ignore_threshold, job)
+    image = scaled
+
+    _report(job, "Проверка чекбокса", 70)
+    meeting_type, rep_bbox, cb_bbox = detect_repeat_checkbox(
+        image, lines, offset=offset, scale=scale
+    )
+    _debug_local.capture = {
+        "image": image,
+        "lines": lines,
+        "offset": offset,
+        "meta": {"scale": scale, "glyph_height": glyph_height, "template_key": layout_key},
+        "repeat_bbox": rep_bbox,
+        "checkbox_bbox": cb_bbox,
+        "checkbox_checked": meeting_type == "Регулярная",
+    }
+    if debug_mode == DEBUG_ALWAYS:
+        debug_writer.submit(_debug_local.capture)
+    if cache is not None:
+        cache.put(cache_key, lines, meeting_type)
+    return lines, meeting_type
+
+class RoomMatcher:
+    """Поиск упоминаний переговорок в строке по их коротким названиям.
+
+    Короткое название — первое слово после номера этажа ("2.Деньги" ->
+    "деньги"); учитываются слова длиннее трёх букв. Все названия ищутся
+    одним проходом автомата Ахо–Корасик.
+    """
+
+    def __init__(self, rooms: Dict[str, List[str]]):
+        self.rooms: List[Tuple[str, str]] = []
+        first_room: Dict[str, int] = {}
+        for bz_key, names in rooms.items():
+            for room_name in names:
+                words = room_name.split(".")[-1].split()
+                short = words[0].lower() if words else ""
+                if len(short) > 3 and short not in first_room:
+                    first_room[short] = len(self.rooms)
+                self.rooms.append((bz_key, room_name))
+        self._pattern_rooms = list(first_room.values())
+        self._automaton = AhoCorasick(first_room.keys())
+
+    def find(self, text: str) -> Tuple[str, str] | None:
+        """Вернуть ``(БЦ, переговорка)`` для первой по списку найденной комнаты."""
+        found = self._automaton.find(text.lower())
+        if not found:
+            return None
+        return self.rooms[min(self._pattern_rooms[i] for i in found)]
+
+
+_room_matcher: Tuple[Dict[str, List[str]], RoomMatcher] | None = None
 
-    # 3. БЦ (ищем по ключевому слову)
-    for txt in texts:
-        if "морозов" in txt.lower():
-            bz = "БЦ Морозов"
-
-    # 4. Переговорка (по частичному совпадению)
-    flat_rooms = []
-    for bz_key, rooms in rooms_by_bz.items():
-        for room_name in rooms:
-            flat_rooms.append((bz_key, room_name))
-
-    for txt in texts:
-        txt_lower = txt.lower()
-        for bz_key, room_name in flat_rooms:
-            short = room_name.split(".")[-1].split()[0].lower()
-            if short and short in txt_lower and len(short) > 3:
-                room = room_name
-                bz = bz_key
+
+def get_room_matcher(rooms: Dict[str, List[str]]) -> RoomMatcher:
+    """Вернуть автомат поиска переговорок для словаря ``rooms``."""
+    global _room_matcher
+    if _room_matcher is None or _room_matcher[0] is not rooms:
+        _room_matcher = (rooms, RoomMatcher(rooms))
+    return _room_matcher[1]
+
+
+def fields_from_lines(lines: List[Dict]) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """Разобрать строки OCR в поля.
+
+    Поля берутся разбором по геометрии рамок; пустые имя, БЦ и переговорка
+    дополняются узким запасным проходом по тексту строк.
+    """
+    logging.debug("[OCR] Lines: %s", [l["text"] for l in lines])
+    parsed, scores = parse_lines(lines)
+    if parsed.get("room_raw"):
+        texts_all = [l["text"] for l in lines]
+        parsed["room_raw"] = choose_longer_room(parsed["room_raw"], texts_all)
+    return parsed, scores
+
+
+def parse_lines(lines: List[Dict]) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """Разобрать строки по геометрии и дополнить пустые имя, БЦ и переговорку."""
+    parsed, scores = parse_fields_layout(lines, return_scores=True)
+    if not parsed["name"] or not parsed["bz_raw"] or not parsed["room_raw"]:
+        logging.debug("[OCR] Layout parse incomplete, running text fallback")
+        _fill_name_and_room(_prepare_lines(lines), parsed, scores)
+    return parsed, scores
+
+
+def _fill_name_and_room(
+    lines: List[Dict], fields: Dict[str, str], scores: Dict[str, float]
+) -> None:
+    """Заполнить пустые поля без геометрии рамок.
+
+    Имя — первое слово строки, следующей за меткой «Организатор» в порядке
+    чтения; БЦ и переговорка — первая известная переговорка в строке, не
+    похожей на метку.
+    """
+    if not fields["name"]:
+        for label_line, line in zip(lines, lines[1:]):
+            if label_line["label"] == "организатор" and not line["label"] and line["text"].split():
+                fields["name"] = clean_name(line["text"].split()[0])
+                scores["name"] = line["score"]
                 break
+    if fields["bz_raw"] and fields["room_raw"]:
+        return
+    matcher = get_room_matcher(rooms_by_bz)
+    for line in lines:
+        # Подстрока вроде «зато» в «Организатор» — не переговорка
+        found = None if line["label"] else matcher.find(line["text"])
+        if found is None:
+            continue
+        bz, room = found
+        if not fields["bz_raw"]:
+            fields["bz_raw"], scores["bz_raw"] = bz, line["score"]
+        if not fields["room_raw"]:
+            fields["room_raw"], scores["room_raw"] = room, line["score"]
+        break
+
 
-    return name, bz, room, date, start_time, end_time
+def recognize_image(
+    img: Image.Image | np.ndarray,
+    *,
+    use_gpu: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    engine_options: dict | None = None,
+    debug_mode: str = DEBUG_OFF,
+    workers: int | None = None,
+    job: OcrJob | None = None,
+) -> Tuple[Dict[str, str], Dict[str, float], str]:
+    """Распознать встречу на изображении без обращения к интерфейсу."""
+    lines, meeting_type = run_ocr(
+        img,
+        use_gpu=use_gpu,
+        engine=engine,
+        engine_options=engine_options,
+        debug_mode=debug_mode,
+        workers=workers,
+        job=job,
+    )
+    _report(job, "Разбор полей", 90)
+    parsed, scores = fields_from_lines(lines)
+    validated = validate_with_rooms(
+        parsed, rooms_by_bz, fuzzy_threshold=ROOM_FUZZY_THRESHOLD
+    )
+    remote = getattr(_debug_local, "remote", None)
+    if remote is not None:
+        worker, request_id = remote
+        worker.feedback(request_id, validated, debug_mode)
+    else:
+        _finish_capture(getattr(_debug_local, "capture", None), validated, debug_mode)
+    _debug_local.capture = None
+    _debug_local.remote = None
+    if job is not None:
+        job.check()
+    return validated, scores, meeting_type
+
+
+def _finish_capture(capture: Dict | None, validated: Dict[str, str], debug_mode: str) -> None:
+    """Выучить шаблон по удачному разбору или сохранить отладку неудачного."""
+    if not capture:
+        return
+    if "template_key" in capture["meta"] and all(validated.values()):
+        _learn_template(capture["meta"]["template_key"], capture["lines"], capture["meta"]["scale"])
+    if debug_mode == DEBUG_ON_FAILURE and not all(validated.values()):
+        capture["meta"]["missing"] = [k for k, v in validated.items() if not v]
+        debug_writer.submit(capture)
+
+
+def _set_autofill_status(ctx: UIContext, text: str | None = None) -> None:
+    """Показать состояние автозаполнения на кнопке главного окна."""
+    btn = getattr(ctx.window, "cv_btn", None)
+    if btn is None:
+        return
+    if text is None:
+        text = _AUTOFILL_TEXT
+        if _ocr_state == "loading":
+            text += " (загрузка OCR…)"
+    btn.setText(text)
+
+
+def cancel_clipboard_ocr(ctx: UIContext) -> None:
+    """Отменить текущее фоновое распознавание, если оно запущено."""
+    global _current_job
+    if _current_job is None:
+        return
+    logging.info("[OCR] Autofill job cancelled")
+    _current_job.cancel()
+    _current_job = None
+    _set_autofill_status(ctx)
+
+
+def _autofill_request(ctx: UIContext) -> Dict:
+    """Собрать параметры ``recognize_image`` из настроек."""
+    configure_ocr_cache(ctx.ocr_cache_enabled, ctx.ocr_cache_persist)
+    return {
+        "use_gpu": ctx.ocr_mode == "GPU",
+        "engine": ctx.ocr_engine,
+        "engine_options": engine_options(ctx),
+        "debug_mode": ctx.ocr_debug_mode,
+        "workers": ctx.ocr_workers,
+    }
+
+
+def _autofill_done(ctx: UIContext, job: OcrJob) -> Callable[[tuple], None]:
+    """Вернуть обработчик результата задачи автозаполнения ``job``."""
+
+    @Slot(object)
+    def on_done(result_error):
+        global _current_job
+        if job is not _current_job:
+            return
+        _current_job = None
+        _set_autofill_status(ctx)
+        result, error = result_error
+        if isinstance(error, OcrCancelled):
+            return
+        if error:
+            logging.error("[OCR] Autofill failed: %s", error)
+            QMessageBox.critical(ctx.window, "Ошибка", f"Не удалось распознать изображение:\n{error}")
+            return
+        validated, scores, meeting_type = result
+        update_gui_fields(validated, ctx, scores=scores, meeting_type=meeting_type)
+        if getattr(ctx, "auto_generate_after_autofill", False):
+            from logic.generator import generate_message
+            generate_message(ctx)
+
+    return on_done
 
 
 def recognize_from_clipboard(ctx: UIContext) -> None:
-    """Распознать встречу по изображению из буфера обмена."""
+    """Распознать встречу по изображению из буфера обмена.
+
+    Распознавание выполняется в пуле потоков, повторный вызов заменяет
+    ещё не завершённую задачу. Если скриншот уже распознаётся заранее
+    (см. ``start_clipboard_watcher``), используется этот результат.
+    """
+    global _current_job, _speculative
+    request = _autofill_request(ctx)
+    spec = _speculative
+    _speculative = None
+    if spec is not None and spec.matches(request):
+        if _current_job is not None:
+            _current_job.cancel()
+        _current_job = spec.job
+        logging.info(
+            "[OCR] Using speculative clipboard OCR (%s)",
+            "ready" if spec.result is not None else "running",
+        )
+        _set_autofill_status(ctx, "Распознавание…")
+        spec.adopt(
+            lambda stage, percent: _set_autofill_status(ctx, f"{stage}… {percent}%"),
+            _autofill_done(ctx, spec.job),
+        )
+        return
+    if spec is not None:
+        spec.job.cancel()
+
     img = get_image_from_clipboard()
     if img is None:
         QMessageBox.critical(ctx.window, "Ошибка", "Буфер обмена не содержит изображение.")
         return
 
-    lines, meeting_type = run_ocr(img, use_gpu=ctx.ocr_mode == "GPU")
-    parsed, scores = parse_fields(lines, return_scores=True)
-    print("[DEBUG] OCR lines:", [l["text"] for l in lines])
-
-    need_fallback = not parsed.get("name") or scores.get("name", 1.0) < 0.5
-    if need_fallback:
-        texts: List[str] = [l["text"] for l in lines]
-        name, bz, room, date, start, end = extract_fields_from_text(texts, rooms_by_bz)
-        if name and not parsed.get("name"):
-            parsed["name"] = name
-        if bz and not parsed.get("bz_raw"):
-            parsed["bz_raw"] = bz
-        if room and not parsed.get("room_raw"):
-            parsed["room_raw"] = room
-        if date and not parsed.get("date"):
-            parsed["date"] = date
-        if start and not parsed.get("start"):
-            parsed["start"] = start
-        if end and not parsed.get("end"):
-            parsed["end"] = end
+    if _current_job is not None:
+        logging.info("[OCR] Replacing running autofill job")
+        _current_job.cancel()
+
+    job = OcrJob(
+        on_progress=lambda stage, percent: _set_autofill_status(
+            ctx, f"{stage}… {percent}%"
+        )
+    )
+    _current_job = job
+    _set_autofill_status(ctx, "Распознавание… 0%")
+    run_in_thread(lambda: recognize_image(img, job=job, **request), _autofill_done(ctx, job))
+
+
+class _SpeculativeOcr:
+    """Распознавание скриншота, запущенное сразу после копирования.
+
+    Результат ждёт нажатия кнопки автозаполнения; до этого прогресс
+    никуда не выводится.
+    """
+
+    def __init__(self, request: Dict) -> None:
+        self.request = request
+        self.job = OcrJob(on_progress=self._progress)
+        self.result: tuple | None = None
+        self._on_progress: Callable[[str, int], None] | None = None
+        self._on_done: Callable[[tuple], None] | None = None
+
+    def matches(self, request: Dict) -> bool:
+        """Проверить, что распознавание шло с теми же настройками."""
+        return {**self.request, "debug_mode": None} == {**request, "debug_mode": None}
+
+    def _progress(self, stage: str, percent: int) -> None:
+        if self._on_progress is not None:
+            self._on_progress(stage, percent)
+
+    def finish(self, result_error: tuple) -> None:
+        self.result = result_error
+        if self._on_done is not None:
+            self._on_done(result_error)
+
+    def adopt(
+        self,
+        on_progress: Callable[[str, int], None],
+        on_done: Callable[[tuple], None],
+    ) -> None:
+        """Передать результат кнопке: сразу, если он готов, иначе по завершении."""
+        self._on_progress = on_progress
+        self._on_done = on_done
+        if self.result is not None:
+            on_done(self.result)
+
+
+_speculative: _SpeculativeOcr | None = None
+
+
+def _discard_speculative() -> None:
+    """Отменить заранее запущенное распознавание, буфер обмена изменился."""
+    global _speculative
+    if _speculative is not None:
+        logging.debug("[OCR] Clipboard changed, speculative OCR discarded")
+        _speculative.job.cancel()
+        _speculative = None
+
+
+def _start_speculative_ocr(ctx: UIContext) -> None:
+    """Начать распознавание скриншота из буфера обмена до нажатия кнопки."""
+    global _speculative
+    _discard_speculative()
+    if not ctx.ocr_clipboard_watch or _current_job is not None:
+        return
+    img = get_image_from_clipboard()
+    if img is None:
+        return
+    request = _autofill_request(ctx)
+    # Отладочные записи пишутся только для распознаваний по кнопке
+    request["debug_mode"] = DEBUG_OFF
+    spec = _SpeculativeOcr(request)
+    _speculative = spec
+    logging.debug(
+        "[OCR] Speculative OCR started for %dx%d clipboard image", img.shape[1], img.shape[0]
+    )
+
+    @Slot(object)
+    def on_done(result_error):
+        if isinstance(result_error[1], OcrCancelled):
+            return
+        spec.finish(result_error)
+
+    run_in_thread(lambda: recognize_image(img, job=spec.job, **request), on_done)
+
+
+def start_clipboard_watcher(ctx: UIContext) -> None:
+    """Следить за буфером обмена и заранее распознавать скопированные скриншоты.
+
+    Распознавание начинается через ``CLIPBOARD_DEBOUNCE_MS`` после последнего
+    изменения буфера при включённом ``ctx.ocr_clipboard_watch``; новое
+    изменение буфера отменяет его и отбрасывает результат.
+    """
+    timer = QTimer(ctx.window)
+    timer.setSingleShot(True)
+    timer.setInterval(CLIPBOARD_DEBOUNCE_MS)
+    timer.timeout.connect(lambda: _start_speculative_ocr(ctx))
+    ctx.clipboard_timer = timer
+
+    def on_clipboard_changed() -> None:
+        _discard_speculative()
+        if not ctx.ocr_clipboard_watch:
+            return
+        mime = QGuiApplication.clipboard().mimeData()
+        if mime is not None and mime.hasImage():
+            timer.start()
+        else:
+            timer.stop()
+
+    QGuiApplication.clipboard().dataChanged.connect(on_clipboard_changed)
 
-    if parsed.get("room_raw"):
-        texts_all = [l["text"] for l in lines]
-        parsed["room_raw"] = choose_longer_room(parsed["room_raw"], texts_all)
 
-    validated = validate_with_rooms(parsed, rooms_by_bz, fuzzy_threshold=0.6)
-    update_gui_fields(validated, ctx, scores=scores, meeting_type=meeting_type)
-    if getattr(ctx, "auto_generate_after_autofill", False):
-        from logic.generator import generate_message
-        generate_message(ctx)
-    
 def is_label_like(text, label):
     """Проверить схожесть текста с заданной меткой."""
-    return SequenceMatcher(None, text.lower(), label.lower()).ratio() > 0.7
+    return fuzz.ratio(text.lower(), label.lower()) > LABEL_SIMILARITY
 
 
 def is_any_label(text: str, labels: List[str]) -> bool:
     """Вернуть ``True``, если текст похож хотя бы на одну метку."""
     return any(is_label_like(text, lbl) for lbl in labels)
 
-def save_debug_ocr_image(
-    image: Image.Image,
-    lines: List[Dict],
-    path: str = "ocr_debug_output.jpg",
-    *,
-    repeat_bbox: Tuple[int, int, int, int] | None = None,
-    checkbox_bbox: Tuple[int, int, int, int] | None = None,
-    checkbox_checked: bool | None = None,
-):
-    """Сохранить изображение с разметкой и JSON для отладки."""
-
-    if not lines:
-        return
 
-    img_copy = image.copy()
-    draw = ImageDraw.Draw(img_copy)
-
-    try:
-        font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", 16)
-    except Exception:
-        font = ImageFont.load_default()
-
-    for line in lines:
-        bbox = [tuple(p) for p in line["bbox"]]
-        draw.polygon(bbox, outline="red", width=2)
-        text = f"{line['text']} {line['score']:.2f}"
-        draw.text((bbox[0][0], bbox[0][1] - 15), text, fill="red", font=font)
-
-    if repeat_bbox:
-        x, y, w, h = repeat_bbox
-        draw.rectangle([x, y, x + w, y + h], outline="blue", width=2)
-    if checkbox_bbox:
-        x, y, w, h = checkbox_bbox
-        color = "green" if checkbox_checked else "red"
-        draw.rectangle([x, y, x + w, y + h], outline=color, width=2)
-
-    img_copy.save(path)
-
-    debug_info = [
-        {"text": line["text"], "score": line["score"], "bbox": line["bbox"]}
-        for line in lines
-    ]
-    with open(Path(path).with_suffix(".json"), "w", encoding="utf-8") as f:
-        import json
-        json.dump(debug_info, f, ensure_ascii=False, indent=2)
+def classify_labels(texts: List[str]) -> List[Tuple[str, float]]:
+    """Определить для каждой строки ближайшую метку из ``LABEL_VOCAB``.
 
+    Все строки сравниваются со словарём меток одним вызовом
+    ``rapidfuzz.process.cdist``. Для строк, не похожих ни на одну метку,
+    возвращается ``("", оценка)``.
+    """
+    if not texts:
+        return []
+    matrix = process.cdist(
+        [t.lower() for t in texts], LABEL_VOCAB, scorer=fuzz.ratio, workers=1
+    )
+    result = []
+    for row in matrix:
+        best = int(row.argmax())
+        score = float(row[best])
+        label = LABEL_VOCAB[best] if score > LABEL_SIMILARITY else ""
+        result.append((label, score / 100))
+    return result
 
 def detect_repeat_checkbox(
-    image: Image.Image, lines: List[Dict]
+    image: Image.Image | np.ndarray,
+    lines: List[Dict],
+    *,
+    offset: Tuple[int, int] = (0, 0),
+    scale: float = 2.0,
 ) -> Tuple[str, Tuple[int, int, int, int] | None, Tuple[int, int, int, int] | None]:
-    """Определить тип встречи по чекбоксу рядом с меткой 'Повторять'."""
+    """Определить тип встречи по чекбоксу рядом с меткой 'Повторять'.
+
+    ``offset`` — положение ``image`` в координатах рамок ``lines``,
+    ``scale`` — во сколько раз изображение увеличено относительно скриншота.
+    """
     meeting_type = "Обычная"
     repeat_bbox = None
     checkbox_bbox = None
-    np_img = np.array(image)
+    np_img = np.asarray(image)
+    ox, oy = offset
+    cb_offset = round(CHECKBOX_X_OFFSET * scale / 2)
+    cb_size = round(CHECKBOX_SIZE * scale / 2)
 
     found_repeat = False
 
@@ -354,20 +1394,18 @@ def detect_repeat_checkbox(
             h = y2 - y1
             repeat_bbox = (x1, y1, w, h)
 
-            cb_x1 = max(x1 - CHECKBOX_X_OFFSET, 0)
-            cb_y1 = max(int(y1 + h / 2 - CHECKBOX_SIZE / 2), 0)
-            cb_x2 = min(cb_x1 + CHECKBOX_SIZE, np_img.shape[1])
-            cb_y2 = min(cb_y1 + CHECKBOX_SIZE, np_img.shape[0])
-            checkbox_bbox = (cb_x1, cb_y1, cb_x2 - cb_x1, cb_y2 - cb_y1)
+            cb_x1 = max(x1 - ox - cb_offset, 0)
+            cb_y1 = max(int(y1 - oy + h / 2 - cb_size / 2), 0)
+            cb_x2 = min(cb_x1 + cb_size, np_img.shape[1])
+            cb_y2 = min(cb_y1 + cb_size, np_img.shape[0])
+            checkbox_bbox = (cb_x1 + ox, cb_y1 + oy, cb_x2 - cb_x1, cb_y2 - cb_y1)
 
             roi = np_img[cb_y1:cb_y2, cb_x1:cb_x2]
             if roi.size > 0:
-                cv2.imwrite("checkbox_roi.jpg", roi)
                 gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
                 _, thresh = cv2.threshold(gray, CHECKBOX_THRESHOLD, 255, cv2.THRESH_BINARY)
                 dark_ratio = (gray < CHECKBOX_THRESHOLD).mean()
-                # ДЕБАГ
-                print(f"[DEBUG] dark_ratio = {dark_ratio:.4f}")
+                logging.debug("[OCR] Checkbox dark ratio %.4f", dark_ratio)
                 if dark_ratio > CHECKBOX_DARK_RATIO:
                     meeting_type = "Регулярная"
             break
@@ -390,7 +1428,6 @@ def detect_repeat_checkbox(
             fragment_found = False
             for ln in lines:
                 lx1 = min(p[0] for p in ln["bbox"])
-                lx2 = max(p[0] for p in ln["bbox"])
                 ly1 = min(p[1] for p in ln["bbox"])
                 ly2 = max(p[1] for p in ln["bbox"])
                 if lx1 >= x_right and ly1 <= y_bottom and ly2 >= y_top:
@@ -405,43 +1442,11 @@ def detect_repeat_checkbox(
     return meeting_type, repeat_bbox, checkbox_bbox
 
 
-def extract_bc_and_room(lines: List[Dict], known_bz: List[str]) -> Tuple[str, str]:
-    """Попытаться найти БЦ и переговорку в тексте OCR."""
-    bz_raw = ""
-    room_raw = ""
-
-    for i, line in enumerate(lines):
-        lower = line["text"].lower()
-
-        # Находим подходящий БЦ
-        matched_bz = None
-        for bz in known_bz:
-            if bz.lower() in lower:
-                matched_bz = bz
-                break
-
-        if matched_bz:
-            bz_raw = matched_bz
-
-            # Попробуем взять переговорку на следующих 1–3 строках
-            for j in range(i + 1, min(len(lines), i + 4)):
-                candidate = lines[j]["text"].strip()
-                if candidate:
-                    room_raw = candidate
-                    break
-            break  # Выход из цикла — нашли
-
-    return bz_raw, room_raw
-
-
-
-
 # -----------------------------------------------
 # Основной парсер
 # -----------------------------------------------
-def parse_fields(ocr_lines: list, *, return_scores: bool = False):
-    """Разобрать строки OCR в структурированные поля."""
-
+def _prepare_lines(ocr_lines: list) -> List[Dict]:
+    """Нормализовать строки OCR и пометить их классом метки."""
     lines = []
     for l in ocr_lines:
         raw = l["text"].strip()
@@ -452,184 +1457,173 @@ def parse_fields(ocr_lines: list, *, return_scores: bool = False):
             norm = normalize_russian(norm)
         lines.append({**l, "text": raw, "norm": norm, "raw_text": raw})
 
+    for line, (label, label_score) in zip(lines, classify_labels([l["norm"] for l in lines])):
+        line["label"] = label
+        line["label_score"] = label_score
+    return lines
+
+
+def _parse_date(text: str) -> str | None:
+    """Вернуть дату ``dd.mm.yy(yy)`` из текста, если она корректна."""
+    match = _DATE_RE.search(text)
+    if not match:
+        return None
+    candidate = match.group(0)
+    for fmt in ("%d.%m.%Y", "%d.%m.%y"):
+        try:
+            datetime.strptime(candidate, fmt)
+            return candidate
+        except ValueError:
+            continue
+    return None
+
+
+def _empty_fields() -> Tuple[Dict[str, str], Dict[str, float]]:
     fields = {"name": "", "bz_raw": "", "room_raw": "", "date": "", "start": "", "end": ""}
-    scores = {"name": 0.0, "bz_raw": 0.0, "room_raw": 0.0, "date": 0.0, "start": 0.0, "end": 0.0}
+    return fields, {k: 0.0 for k in fields}
 
-    bz_idx = None
 
-    for i, line in enumerate(lines):
-        txt_norm = line["norm"]
+def parse_fields_layout(
+    ocr_lines: list,
+    *,
+    return_scores: bool = False,
+    sources: Dict[str, List[Dict]] | None = None,
+):
+    """Разобрать строки OCR, сопоставляя метки и значения по геометрии рамок.
 
-        if is_label_like(txt_norm, "организатор"):
-            if line["score"] < SCORE_THRESHOLD:
-                logging.warning(
-                    "[OCR] Low confidence label 'Организатор' (%.2f)", line["score"]
-                )
-            parts = []
-            part_scores = []
-            for j in range(i + 1, i + 3):
-                if j >= len(lines):
-                    break
-                jnorm = lines[j]["norm"]
-                if (
-                    is_label_like(jnorm, "участники")
-                    or "участник" in jnorm
-                    or is_any_label(jnorm, [
-                        "время",
-                        "время и дата",
-                        "дата",
-                        "дата и время",
-                        "переговорка",
-                        "место",
-                        "адрес",
-                        "бц",
-                    ])
-                ):
-                    break
-                parts.append(lines[j]["text"])
-                part_scores.append(lines[j]["score"])
-            if parts:
-                # Используем только первое слово для большей стабильности
-                first_word = parts[0].split()[0]
-                fields["name"] = clean_name(first_word)
-                scores["name"] = part_scores[0]
-            continue
+    Значение метки ищется справа от неё в том же ряду, затем в ближайших
+    рядах ниже в той же колонке; поиск останавливается на следующей метке.
+    В ``sources`` записываются строки, из которых взято каждое поле, а под
+    ключом ``"time"`` — все строки с цифрами рядом с меткой времени.
+    """
+    lines = _prepare_lines(ocr_lines)
+    layout = Layout(lines, y_tolerance=BBOX_Y_TOLERANCE, max_gap=SPLIT_TOKEN_MAX_GAP)
+    fields, scores = _empty_fields()
+    if sources is None:
+        sources = {}
+
+    def values(line: Dict, max_rows: int = 2) -> List[List[Dict]]:
+        groups = []
+        for group in layout.value_candidates(line, max_rows):
+            if group[0]["label"]:
+                break
+            groups.append(group)
+        return groups
+
+    for line in layout.lines():
+        label = line["label"]
+        norm = line["norm"]
+
+        if label == "организатор" and not fields["name"]:
+            for group in values(line):
+                first = group[0]
+                if "участник" not in first["norm"] and first["text"].split():
+                    fields["name"] = clean_name(first["text"].split()[0])
+                    scores["name"] = first["score"]
+                    sources["name"] = [first]
+                break
 
-        if is_any_label(txt_norm, ["время", "время и дата", "дата и время"]):
-            time_scores = []
-            times = []
-            for j in range(i + 1, i + 5):
-                if j >= len(lines):
-                    break
-                t = normalize_time(lines[j]["raw_text"])
-                if t:
-                    times.append(t)
-                    time_scores.append(lines[j]["score"])
+        elif label in _TIME_LABELS and not fields["start"]:
+            times: list[tuple[str, float]] = []
+            time_lines: List[Dict] = []
+            for group in values(line):
+                # Строки с цифрами рядом с меткой времени — кандидаты на уточнение,
+                # даже если разобрать время в них не удалось
+                sources.setdefault("time", []).extend(
+                    val for val in group if re.search(r"\d", val["text"])
+                )
+                for val in group:
+                    whole = normalize_time(val["raw_text"])
+                    if whole:
+                        tokens = [whole]
+                    else:
+                        fixed = _DATE_RE.sub(" ", fix_ocr_time_garbage(val["raw_text"]))
+                        tokens = re.findall(r"\d{1,2}[:.]\d{2}", fixed)
+                    for token in tokens:
+                        t = normalize_time(token)
+                        if t and (not times or times[-1][0] != t):
+                            times.append((t, val["score"]))
+                            time_lines.append(val)
+                    date = _parse_date(val["raw_text"])
+                    if date and not fields["date"]:
+                        fields["date"], scores["date"] = date, val["score"]
+                        sources["date"] = [val]
             if times:
-                fields["start"] = times[0]
-                scores["start"] = time_scores[0]
+                fields["start"], scores["start"] = times[0]
+                sources["start"] = time_lines[:1]
                 if len(times) > 1:
-                    fields["end"] = times[1]
-                    scores["end"] = time_scores[1]
-            continue
-
-        if is_label_like(txt_norm, "дата") and not fields["date"]:
-            for j in range(i + 1, i + 3):
-                if j >= len(lines):
-                    break
-                candidate = lines[j]["raw_text"]
-                if re.match(r"\d{2}\.\d{2}\.\d{2,4}", candidate):
-                    for fmt in ("%d.%m.%Y", "%d.%m.%y"):
-                        try:
-                            datetime.strptime(candidate, fmt)
-                            fields["date"] = candidate
-                            scores["date"] = lines[j]["score"]
-                            break
-                        except ValueError:
-                            continue
+                    fields["end"], scores["end"] = times[1]
+                    sources["end"] = time_lines[1:2]
+
+        elif label == "дата" and not fields["date"]:
+            for group in values(line):
+                for val in group:
+                    date = _parse_date(val["raw_text"])
+                    if date:
+                        fields["date"], scores["date"] = date, val["score"]
+                        sources["date"] = [val]
+                        break
                 if fields["date"]:
                     break
-            continue
-
-        if ("бц" in txt_norm or txt_norm.startswith("бц")) and not fields["bz_raw"]:
-            fields["bz_raw"] = line["text"]
-            scores["bz_raw"] = line["score"]
-            bz_idx = i
-            continue
 
-        if is_label_like(txt_norm, "переговорка") and not fields["room_raw"]:
-            room_parts = []
-            room_scores = []
-            for j in range(i + 1, i + 4):
-                if j >= len(lines):
+        elif label == "переговорка" and not fields["room_raw"]:
+            for group in values(line):
+                parts = []
+                for val in group:
+                    if val["label"] == "адрес" or "выбрать" in val["norm"] or len(val["text"]) <= 2:
+                        continue
+                    if _is_bz_name(val["norm"]):
+                        # Название БЦ над переговоркой — это не переговорка
+                        if not fields["bz_raw"]:
+                            fields["bz_raw"], scores["bz_raw"] = val["text"], val["score"]
+                            sources["bz_raw"] = [val]
+                        continue
+                    parts.append(val)
+                if parts:
+                    fields["room_raw"] = " ".join(val["text"] for val in parts)
+                    scores["room_raw"] = min(val["score"] for val in parts)
+                    sources["room_raw"] = parts
                     break
-                jnorm = lines[j]["norm"]
-                candidate_text = lines[j]["text"].strip()
-                if (
-                    is_label_like(jnorm, "адрес")
-                    or "выбрать" in jnorm
-                    or "бц" in jnorm
-                    or len(candidate_text) <= 2
-                ):
-                    continue
-                room_parts.append(candidate_text)
-                room_scores.append(lines[j]["score"])
-            if room_parts:
-                fields["room_raw"] = " ".join(room_parts)
-                scores["room_raw"] = min(room_scores)
-            continue
-
-
-    if bz_idx is not None and (not fields["room_raw"] or "бц" in normalize_generic(fields["room_raw"])):
-        for j in range(bz_idx + 1, min(len(lines), bz_idx + 4)):
-            if is_label_like(lines[j]["norm"], "адрес") or "выбрать" in lines[j]["norm"]:
-                continue
-            fields["room_raw"] = lines[j]["text"]
-            scores["room_raw"] = lines[j]["score"]
-            break
 
-    if not fields["start"] or not fields["end"]:
-        time_re = re.compile(r"\d{2}[:\.]\d{2}")
-        found: list[tuple[str, float]] = []
-        for line in ocr_lines:
-            text = line["text"].strip()
-            if not re.fullmatch(r"\d{1,2}[:\.]\d{2}", text):
-                continue
-            t = normalize_time(line["text"].strip())
-            if not t:
-                continue
-            if not found or found[-1][0] != t:
-                found.append((t, line["score"]))
-        if found:
-            if not fields["start"]:
-                fields["start"], scores["start"] = found[0]
-            if len(found) > 1 and not fields["end"]:
-                start_val = fields["start"]
-                idx = next((i for i, (tt, _) in enumerate(found) if tt == start_val), 0)
-                if idx + 1 < len(found):
-                    fields["end"], scores["end"] = found[idx + 1]
-
-    if not fields["date"]:
-        for line in ocr_lines:
-            if line.get("score", 0) < 0.45:
-                continue
-            if re.match(r"\d{2}\.\d{2}\.\d{2,4}", line["text"]):
-                for fmt in ("%d.%m.%Y", "%d.%m.%y"):
-                    try:
-                        datetime.strptime(line["text"], fmt)
-                        fields["date"] = line["text"]
-                        scores["date"] = line["score"]
-                        break
-                    except ValueError:
+        elif not fields["bz_raw"] and _is_bz_name(norm):
+            fields["bz_raw"], scores["bz_raw"] = line["text"], line["score"]
+            sources["bz_raw"] = [line]
+            if not fields["room_raw"] or _is_bz_name(normalize_generic(fields["room_raw"])):
+                for group in values(line, max_rows=1):
+                    val = group[0]
+                    if val["label"] == "адрес" or "выбрать" in val["norm"]:
                         continue
-                if fields["date"]:
+                    fields["room_raw"], scores["room_raw"] = val["text"], val["score"]
+                    sources["room_raw"] = [val]
                     break
 
-    if not fields["bz_raw"] or not fields["room_raw"]:
-        known_bz = list(rooms_by_bz.keys())
-        bz_raw, room_raw = extract_bc_and_room(lines, known_bz)
-        if bz_raw and not fields["bz_raw"]:
-            fields["bz_raw"] = bz_raw
-        if room_raw and not fields["room_raw"]:
-            fields["room_raw"] = room_raw
-
-    logging.debug("[OCR] Parsed fields: %s", fields)
+    logging.debug("[OCR] Parsed fields (layout): %s", fields)
     if return_scores:
         return fields, scores
     return fields
 
 
+_ROOM_STOP_WORDS = {"этаж", "мест", "место", "этажей"}
 
 
-def _room_token_ratio(room: str, candidate: str) -> float:
-    cleanup = lambda t: [w for w in re.findall(r"\w+", t.lower()) if w not in {"этаж", "мест", "место", "этажей"} and not w.isdigit()]
-    tokens_room = set(cleanup(room))
-    tokens_cand = set(cleanup(candidate))
+def _room_tokens(text: str) -> set[str]:
+    """Вернуть значимые слова названия переговорки."""
+    return {
+        w for w in re.findall(r"\w+", text.lower())
+        if w not in _ROOM_STOP_WORDS and not w.isdigit()
+    }
+
+
+def _token_ratio(tokens_room: set[str], tokens_cand: set[str]) -> float:
     if not tokens_room:
         return 0.0
     return len(tokens_room & tokens_cand) / len(tokens_room)
 
 
+def _room_token_ratio(room: str, candidate: str) -> float:
+    return _token_ratio(_room_tokens(room), _room_tokens(candidate))
+
+
 _CYR_TO_LAT = str.maketrans({
     "а": "a", "А": "A",
     "в": "b", "В": "B",
@@ -698,10 +1692,78 @@ def choose_longer_room(base: str, texts: List[str]) -> str:
         if norm.startswith(base_norm):
             best = t
     if best != base:
-        print(f"[DEBUG] choose_longer_room: '{base}' -> '{best}'")
+        logging.debug("[OCR] choose_longer_room: '%s' -> '%s'", base, best)
     return best
 
 
+class RoomIndex:
+    """Предвычисленные формы названий переговорок для нечёткого поиска.
+
+    Нормализация кандидатов выполняется один раз при построении индекса,
+    а не при каждом вызове ``validate_with_rooms``.
+    """
+
+    def __init__(self, rooms: Dict[str, List[str]]):
+        self.names: Dict[str, List[str]] = {}
+        self.norm: Dict[str, List[str]] = {}
+        self.ocr_norm: Dict[str, List[str]] = {}
+        self.tokens: Dict[str, List[set[str]]] = {}
+        self.lower: Dict[str, List[str]] = {}
+        for bz, names in rooms.items():
+            names = list(names)
+            self.names[bz] = names
+            self.norm[bz] = [_normalize_room(n) for n in names]
+            self.ocr_norm[bz] = [_normalize_room_with_ocr_fixes(n) for n in names]
+            self.tokens[bz] = [_room_tokens(n) for n in names]
+            self.lower[bz] = [n.lower() for n in names]
+
+    def fuzzy_matches(
+        self, bz: str, query: str, *, ocr_fixes: bool = False, limit: int = 3
+    ) -> List[Tuple[str, float]]:
+        """Вернуть лучшие совпадения ``(название, оценка 0..1)`` в БЦ."""
+        if ocr_fixes:
+            choices = self.ocr_norm.get(bz, [])
+            query_norm = _normalize_room_with_ocr_fixes(query)
+        else:
+            choices = self.norm.get(bz, [])
+            query_norm = _normalize_room(query)
+        matches = process.extract(
+            query_norm, choices, scorer=fuzz.ratio, processor=None, limit=limit
+        )
+        names = self.names[bz]
+        return [(names[idx], score / 100) for _, score, idx in matches]
+
+    def token_match(self, bz: str, query: str) -> Tuple[str | None, float]:
+        """Найти переговорку с наибольшей долей совпавших слов."""
+        query_tokens = _room_tokens(query)
+        best = None
+        best_score = 0.0
+        for name, tokens in zip(self.names.get(bz, []), self.tokens.get(bz, [])):
+            ratio = _token_ratio(query_tokens, tokens)
+            if ratio > best_score:
+                best_score = ratio
+                best = name
+        return best, best_score
+
+    def substring_match(self, bz: str, word: str) -> str | None:
+        """Вернуть первую переговорку, в названии которой есть ``word``."""
+        for name, lower in zip(self.names.get(bz, []), self.lower.get(bz, [])):
+            if word in lower:
+                return name
+        return None
+
+
+_room_index: Tuple[Dict[str, List[str]], RoomIndex] | None = None
+
+
+def get_room_index(rooms: Dict[str, List[str]]) -> RoomIndex:
+    """Вернуть индекс для словаря переговорок, построив его при первом вызове."""
+    global _room_index
+    if _room_index is None or _room_index[0] is not rooms:
+        _room_index = (rooms, RoomIndex(rooms))
+    return _room_index[1]
+
+
 def validate_with_rooms(
     fields: Dict[str, str],
     rooms: Dict[str, List[str]],
@@ -727,20 +1789,13 @@ def validate_with_rooms(
 
     matched_room = None
     if matched_bz:
-        candidates = rooms[matched_bz]
+        index = get_room_index(rooms)
 
         if room_raw:
-            matches = process.extract(
-                room_for_match,
-                candidates,
-                processor=_normalize_room,
-                scorer=fuzz.ratio,
-                limit=3,
-            )
-            top3 = [(m[0], round(m[1] / 100, 2)) for m in matches]
+            matches = index.fuzzy_matches(matched_bz, room_for_match)
+            top3 = [(name, round(score, 2)) for name, score in matches]
             if matches:
-                best_candidate, best_score_raw, _ = matches[0]
-                best_score = best_score_raw / 100
+                best_candidate, best_score = matches[0]
                 logging.debug(
                     "[OCR] Room fuzzy pass1 '%s' -> '%s' (%.2f), top3=%s",
                     room_raw,
@@ -757,17 +1812,10 @@ def validate_with_rooms(
                 )
 
         if room_raw and not matched_room:
-            matches2 = process.extract(
-                room_for_match,
-                candidates,
-                processor=_normalize_room_with_ocr_fixes,
-                scorer=fuzz.ratio,
-                limit=3,
-            )
-            top3_2 = [(m[0], round(m[1] / 100, 2)) for m in matches2]
+            matches2 = index.fuzzy_matches(matched_bz, room_for_match, ocr_fixes=True)
+            top3_2 = [(name, round(score, 2)) for name, score in matches2]
             if matches2:
-                cand2, score_raw2, _ = matches2[0]
-                score2 = score_raw2 / 100
+                cand2, score2 = matches2[0]
                 logging.debug(
                     "[OCR] Room fuzzy pass2 '%s' -> '%s' (%.2f), top3=%s",
                     room_raw,
@@ -790,14 +1838,8 @@ def validate_with_rooms(
                 )
 
         if not matched_room:
-            best = None
-            best_score = 0.0
-            for cand in candidates:
-                ratio = _room_token_ratio(room_for_match, cand)
-                if ratio > best_score:
-                    best_score = ratio
-                    best = cand
-            if best and best_score >= 0.4:
+            best, best_score = index.token_match(matched_bz, room_for_match)
+            if best and best_score >= ROOM_TOKEN_THRESHOLD:
                 matched_room = best
             else:
                 if room_raw:
@@ -807,15 +1849,13 @@ def validate_with_rooms(
                     if words:
                         short = words[0].lower()
                         if len(short) > 3:
-                            for cand in candidates:
-                                if short in cand.lower():
-                                    matched_room = cand
-                                    logging.warning(
-                                        "[OCR] Room matched by short word '%s' despite low fuzzy score %.2f",
-                                        short,
-                                        best_score,
-                                    )
-                                    break
+                            matched_room = index.substring_match(matched_bz, short)
+                            if matched_room:
+                                logging.warning(
+                                    "[OCR] Room matched by short word '%s' despite low fuzzy score %.2f",
+                                    short,
+                                    best_score,
+                                )
 
     if not matched_bz:
         logging.warning("[OCR] Failed to match business center for '%s'", bz_raw)
@@ -883,4 +1923,27 @@ def update_gui_fields(
         ctx.fields["regular"].setCurrentText(value)
 
 
+# Автомат строится один раз при загрузке списка переговорок
+get_room_matcher(rooms_by_bz)
+
+
+def main(argv: List[str] | None = None) -> None:
+    """Консольные команды модуля: ``python -m logic.ocr_paddle <команда>``."""
+    import sys
+
+    argv = sys.argv[1:] if argv is None else argv
+    commands = {
+        "batch": "logic.ocr_batch",
+        "replay": "logic.ocr_replay",
+        "tune": "logic.ocr_tune",
+    }
+    if not argv or argv[0] not in commands:
+        print(f"Использование: python -m logic.ocr_paddle {{{','.join(commands)}}} ...")
+        sys.exit(2)
+    import importlib
+
+    importlib.import_module(commands[argv[0]]).main(argv[1:])
+
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import logging
+from typing import Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+
+# Поиск карточки встречи
+CARD_MIN_PIXELS = 1_000_000
+CARD_MIN_AREA_RATIO = 0.04
+CARD_MAX_AREA_RATIO = 0.85
+CARD_MIN_FILL = 0.85
+CARD_BRIGHT_THRESHOLD = 235
+CARD_ANALYSIS_WIDTH = 800
+CARD_MARGIN = 10
+
+
+def find_event_card(image: np.ndarray) -> Tuple[int, int, int, int] | None:
+    """Найти на скриншоте карточку встречи и вернуть её ``(x, y, w, h)``.
+
+    Карточка календаря — светлый прямоугольник, отделённый от фона тенью
+    или рамкой. Анализ ведётся на уменьшенной копии; если подходящая
+    область не найдена или картинка и так небольшая, возвращается ``None``.
+    """
+    h, w = image.shape[:2]
+    if h * w < CARD_MIN_PIXELS:
+        return None
+
+    ratio = min(1.0, CARD_ANALYSIS_WIDTH / w)
+    small = cv2.resize(image, (int(w * ratio), int(h * ratio)), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+    mask = (gray >= CARD_BRIGHT_THRESHOLD).astype(np.uint8) * 255
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((9, 9), np.uint8))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    total = small.shape[0] * small.shape[1]
+    best = None
+    best_area = 0
+    for cnt in contours:
+        x, y, cw, ch = cv2.boundingRect(cnt)
+        area = cw * ch
+        if not CARD_MIN_AREA_RATIO * total <= area <= CARD_MAX_AREA_RATIO * total:
+            continue
+        if not 0.3 <= cw / ch <= 3.0:
+            continue
+        if cv2.contourArea(cnt) / area < CARD_MIN_FILL:
+            continue
+        if area > best_area:
+            best = (x, y, cw, ch)
+            best_area = area
+
+    if best is None:
+        logging.debug("[OCR] Event card not found, using full image")
+        return None
+
+    x, y, cw, ch = (int(round(v / ratio)) for v in best)
+    x1 = max(x - CARD_MARGIN, 0)
+    y1 = max(y - CARD_MARGIN, 0)
+    x2 = min(x + cw + CARD_MARGIN, w)
+    y2 = min(y + ch + CARD_MARGIN, h)
+    logging.debug("[OCR] Event card found at (%d, %d, %d, %d)", x1, y1, x2 - x1, y2 - y1)
+    return x1, y1, x2 - x1, y2 - y1
+
+
+# Выбор масштаба
+TARGET_GLYPH_HEIGHT = 20
+OCR_SCALES = (1.0, 1.5, 2.0)
+DEFAULT_OCR_SCALE = 2.0
+GLYPH_MIN_COMPONENTS = 20
+
+
+def estimate_glyph_height(image: np.ndarray) -> float | None:
+    """Оценить медианную высоту символов по связным компонентам.
+
+    Возвращает ``None``, если символов найдено слишком мало для оценки.
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    # Тёмная тема: текст светлый, после инверсии фон становится «текстом»
+    if binary.mean() > 127:
+        binary = 255 - binary
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    widths = stats[1:, cv2.CC_STAT_WIDTH]
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    mask = (heights >= 4) & (heights <= 80) & (widths <= 80) & (areas >= 6)
+    if mask.sum() < GLYPH_MIN_COMPONENTS:
+        return None
+    return float(np.median(heights[mask]))
+
+
+def choose_scale(glyph_height: float | None) -> float:
+    """Подобрать наименьший масштаб, при котором символы достаточно крупные."""
+    if not glyph_height:
+        return DEFAULT_OCR_SCALE
+    for scale in OCR_SCALES:
+        if glyph_height * scale >= TARGET_GLYPH_HEIGHT:
+            return scale
+    return OCR_SCALES[-1]
+
+
+def resize_interpolation(scale: float) -> int:
+    """Вернуть интерполяцию OpenCV для увеличения: Ланцош только для сильного."""
+    return cv2.INTER_LANCZOS4 if scale >= 2 else cv2.INTER_CUBIC
+
+
+def as_rgb_array(image: Image.Image | np.ndarray) -> np.ndarray:
+    """Вернуть изображение как массив RGB ``(h, w, 3)`` без лишних копий.
+
+    Массив возвращается как есть (в том числе представление с шагом строки
+    больше ширины), изображение PIL копируется один раз.
+    """
+    if isinstance(image, np.ndarray):
+        return image
+    return np.asarray(image if image.mode == "RGB" else image.convert("RGB"))
@@ -0,0 +1,226 @@
+import ctypes
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from logic.ocr_engines import ENGINES, OcrEngine, create_engine, resolve_engine
+
+try:
+    import psutil
+except Exception:  # psutil не обязателен: память берётся из /proc или не считается
+    psutil = None
+
+# Экземпляр, не использовавшийся дольше этого времени, выгружается
+READER_IDLE_TIMEOUT = 30 * 60
+# Суммарная память загруженных моделей, сверх которой выгружаются старые
+READER_MEMORY_BUDGET_MB = 3072
+
+ReaderKey = Tuple[str, str, Tuple[str, ...], Tuple]
+
+
+def process_rss(pid: int | None = None) -> int:
+    """Вернуть резидентную память процесса ``pid`` (по умолчанию текущего)
+    в байтах (0, если неизвестно)."""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except Exception:
+            return 0
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def _gpu_allocated() -> int:
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            return torch.cuda.memory_allocated()
+    except Exception:
+        pass
+    return 0
+
+
+def release_memory() -> None:
+    """Вернуть системе память выгруженных моделей.
+
+    Собирает циклические ссылки, очищает кеш CUDA у torch (если он уже
+    загружен) и просит glibc отдать освободившиеся страницы.
+    """
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        try:
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+    if sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+def reader_key(engine: str, use_gpu: bool, options: Dict) -> ReaderKey:
+    """Вернуть ключ экземпляра: движок, устройство, языки и параметры."""
+    engine_cls = ENGINES.get(engine)
+    languages = tuple(engine_cls.languages) if engine_cls else ()
+    return engine, "gpu" if use_gpu else "cpu", languages, tuple(sorted(options.items()))
+
+
+def _resolve(engine: str, options: Dict) -> Tuple[str, Dict]:
+    """Заменить недоступный движок движком по умолчанию; его параметры тогда не нужны."""
+    resolved = resolve_engine(engine)
+    return resolved, options if resolved == engine else {}
+
+
+class _Entry:
+    def __init__(self, reader: OcrEngine, load_time: float, rss: int, gpu: int):
+        self.reader = reader
+        self.load_time = load_time
+        self.rss = rss
+        self.gpu = gpu
+        self.last_used = time.monotonic()
+        self.uses = 0
+
+
+class ReaderRegistry:
+    """Прогретые экземпляры движков OCR, по одному на набор параметров.
+
+    Экземпляры для CPU и GPU (и разных движков) живут одновременно, так что
+    переключение режима в настройках не перезагружает модель. Давно не
+    использованные экземпляры и превышение бюджета памяти освобождают место;
+    ``idle_timeout=None`` отключает выгрузку по простою.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float | None = READER_IDLE_TIMEOUT,
+        memory_budget_mb: float = READER_MEMORY_BUDGET_MB,
+        factory: Callable[..., OcrEngine] = create_engine,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self.memory_budget_mb = memory_budget_mb
+        self._factory = factory
+        self._entries: Dict[ReaderKey, _Entry] = {}
+        self._loading: Dict[ReaderKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def has(self, engine: str, use_gpu: bool, options: Dict) -> bool:
+        """Проверить, загружен ли экземпляр с такими параметрами."""
+        engine, options = _resolve(engine, options)
+        return reader_key(engine, use_gpu, options) in self._entries
+
+    def get(self, engine: str, use_gpu: bool = False, options: Dict | None = None) -> OcrEngine:
+        """Вернуть экземпляр движка, загрузив его при первом обращении.
+
+        Недоступный движок заменяется движком по умолчанию до построения
+        ключа, чтобы замена не числилась под чужим именем.
+        """
+        engine, options = _resolve(engine, options or {})
+        key = reader_key(engine, use_gpu, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            loading = self._loading.setdefault(key, threading.Lock())
+        if entry is None:
+            # Загрузка одного движка не блокирует обращения к уже загруженным
+            with loading:
+                entry = self._entries.get(key) or self._load(key, engine, use_gpu, options)
+        with self._lock:
+            entry.last_used = time.monotonic()
+            entry.uses += 1
+        self.evict(keep=key)
+        return entry.reader
+
+    def _load(self, key: ReaderKey, engine: str, use_gpu: bool, options: Dict) -> _Entry:
+        rss_before = process_rss()
+        gpu_before = _gpu_allocated()
+        start = time.perf_counter()
+        reader = self._factory(engine, use_gpu, **options)
+        entry = _Entry(
+            reader,
+            time.perf_counter() - start,
+            max(0, process_rss() - rss_before),
+            max(0, _gpu_allocated() - gpu_before),
+        )
+        with self._lock:
+            self._entries[key] = entry
+        logging.info(
+            "[OCR] %s (%s) loaded in %.2fs, +%.0f MB",
+            engine,
+            key[1],
+            entry.load_time,
+            entry.rss / 2**20,
+        )
+        return entry
+
+    def evict(self, keep: ReaderKey | None = None) -> List[ReaderKey]:
+        """Выгрузить простаивающие экземпляры и уложиться в бюджет памяти.
+
+        Экземпляр ``keep`` (только что запрошенный) не выгружается.
+        """
+        removed: List[ReaderKey] = []
+        with self._lock:
+            now = time.monotonic()
+            for key, entry in list(self._entries.items()):
+                if (
+                    key != keep
+                    and self.idle_timeout is not None
+                    and now - entry.last_used > self.idle_timeout
+                ):
+                    removed.append(key)
+                    del self._entries[key]
+            budget = self.memory_budget_mb * 2**20
+            by_age = sorted(
+                (k for k in self._entries if k != keep),
+                key=lambda k: self._entries[k].last_used,
+            )
+            while by_age and sum(e.rss for e in self._entries.values()) > budget:
+                key = by_age.pop(0)
+                removed.append(key)
+                del self._entries[key]
+        for key in removed:
+            logging.info("[OCR] Unloaded %s (%s)", key[0], key[1])
+        if removed:
+            release_memory()
+        return removed
+
+    def clear(self) -> None:
+        """Выгрузить все экземпляры."""
+        with self._lock:
+            self._entries.clear()
+        release_memory()
+
+    def memory_mb(self) -> float:
+        """Вернуть оценку памяти загруженных экземпляров в мегабайтах."""
+        with self._lock:
+            return sum(e.rss + e.gpu for e in self._entries.values()) / 2**20
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> List[Dict]:
+        """Вернуть время загрузки, память и простой каждого экземпляра."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "engine": key[0],
+                    "device": key[1],
+                    "languages": list(key[2]),
+                    "load_time": round(entry.load_time, 2),
+                    "rss_mb": round(entry.rss / 2**20, 1),
+                    "gpu_mb": round(entry.gpu / 2**20, 1),
+                    "idle": round(now - entry.last_used, 1),
+                    "uses": entry.uses,
+                }
+                for key, entry in self._entries.items()
+            ]
@@ -0,0 +1,116 @@
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+FIELDS = ("name", "date", "start", "end", "bz", "room")
+
+
+def load_debug_json(path: str | Path) -> Tuple[List[Dict], Dict]:
+    """Загрузить строки OCR из отладочного JSON.
+
+    Поддерживается текущий формат ``{"lines": [...], ...}`` и старый —
+    просто список строк. Возвращает строки и остальные поля файла
+    (например, ``scale`` или эталонные ``expected``).
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        return data, {}
+    meta = {k: v for k, v in data.items() if k != "lines"}
+    return data.get("lines", []), meta
+
+
+def find_debug_json(root: str | Path) -> List[Path]:
+    """Найти отладочные JSON в папке (рекурсивно) или вернуть сам файл."""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(root.rglob("*.json"))
+
+
+def replay_lines(lines: List[Dict]) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """Прогнать строки через разбор и сопоставление переговорок без OCR."""
+    from constants import rooms_by_bz
+    from logic.ocr_paddle import (
+        ROOM_FUZZY_THRESHOLD,
+        choose_longer_room,
+        parse_lines,
+        validate_with_rooms,
+    )
+
+    timings: Dict[str, float] = {}
+    lines = [
+        {**l, "raw_text": l.get("raw_text", l["text"]), "score": float(l.get("score", 1.0))}
+        for l in lines
+    ]
+
+    t = time.perf_counter()
+    parsed, _ = parse_lines(lines)
+    timings["parse_lines"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    if parsed.get("room_raw"):
+        parsed["room_raw"] = choose_longer_room(parsed["room_raw"], [l["text"] for l in lines])
+    timings["choose_longer_room"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    validated = validate_with_rooms(
+        parsed, rooms_by_bz, fuzzy_threshold=ROOM_FUZZY_THRESHOLD
+    )
+    timings["validate_with_rooms"] = time.perf_counter() - t
+    return validated, timings
+
+
+def replay_file(path: str | Path) -> Dict:
+    """Разобрать один отладочный JSON и сравнить с эталоном, если он есть."""
+    lines, meta = load_debug_json(path)
+    fields, timings = replay_lines(lines)
+    record: Dict = {
+        "file": str(path),
+        "fields": fields,
+        "timings": {k: round(v * 1000, 3) for k, v in timings.items()},
+    }
+    expected = meta.get("expected")
+    if expected:
+        record["mismatches"] = {
+            k: {"expected": expected[k], "got": fields.get(k, "")}
+            for k in FIELDS
+            if k in expected and expected[k] != fields.get(k, "")
+        }
+    return record
+
+
+def main(argv: List[str]) -> None:
+    """Точка входа ``python -m logic.ocr_paddle replay <json|dir>``.
+
+    Печатает по одной JSON-записи на файл. Код возврата 1, если хотя бы
+    одно поле не совпало с эталоном ``expected``.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m logic.ocr_paddle replay")
+    parser.add_argument("path", help="отладочный JSON или папка с ними")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+    out = sys.stdout
+    failed = 0
+    total = 0.0
+    paths = find_debug_json(args.path)
+    for path in paths:
+        try:
+            record = replay_file(path)
+        except Exception as e:
+            record = {"file": str(path), "error": str(e)}
+        failed += bool(record.get("mismatches") or record.get("error"))
+        total += sum(record.get("timings", {}).values())
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(
+        f"[REPLAY] {len(paths)} files, {failed} failed, {total:.1f} ms total",
+        file=sys.stderr,
+    )
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,319 @@
+"""Синтетические скриншоты карточки встречи и бенчмарк распознавания.
+
+Использование::
+
+    python -m logic.ocr_synth generate out_dir -n 200 [--seed 1]
+    python -m logic.ocr_synth bench out_dir [--engine EasyOCR] [--scale auto 1 2]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/arial.ttf",
+    "C:/Windows/Fonts/segoeui.ttf",
+    "C:/Windows/Fonts/calibri.ttf",
+    "C:/Windows/Fonts/tahoma.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+]
+
+FIRST_NAMES = [
+    "Иван", "Анна", "Мария", "Пётр", "Ольга", "Дмитрий", "Елена",
+    "Сергей", "Наталья", "Алексей", "Татьяна", "Михаил", "Ксения",
+]
+LAST_NAMES = [
+    "Петров", "Смирнова", "Иванов", "Кузнецова", "Соколов", "Попова",
+    "Лебедев", "Козлова", "Новиков", "Морозова", "Волков", "Фёдорова",
+]
+RENDER_SCALES = (1.0, 1.25, 1.5, 2.0)
+FIELDS = ("name", "date", "start", "end", "bz", "room", "meeting_type")
+
+
+def available_fonts() -> List[str]:
+    """Вернуть найденные в системе шрифты с кириллицей."""
+    return [p for p in FONT_CANDIDATES if os.path.isfile(p)]
+
+
+def _random_truth(rng: random.Random, rooms_by_bz: Dict[str, List[str]]) -> Dict[str, str]:
+    bz = rng.choice(list(rooms_by_bz))
+    day = datetime(2025, 1, 1) + timedelta(days=rng.randrange(730))
+    start = datetime(2025, 1, 1, rng.randrange(8, 19), rng.choice((0, 15, 30, 45)))
+    end = start + timedelta(minutes=rng.choice((30, 45, 60, 90, 120)))
+    return {
+        "name": rng.choice(FIRST_NAMES),
+        "last_name": rng.choice(LAST_NAMES),
+        "date": day.strftime("%d.%m.%Y"),
+        "start": start.strftime("%H:%M"),
+        "end": end.strftime("%H:%M"),
+        "bz": bz,
+        "room": rng.choice(rooms_by_bz[bz]),
+        "meeting_type": rng.choice(("Обычная", "Регулярная")),
+    }
+
+
+def render_card(
+    truth: Dict[str, str],
+    *,
+    font_path: str,
+    scale: float = 1.0,
+    noise: float = 0.0,
+    background: bool = False,
+    rng: random.Random | None = None,
+    lines: List[Dict] | None = None,
+) -> Image.Image:
+    """Нарисовать карточку встречи в стиле календаря.
+
+    Метки расположены в левой колонке, значения — справа; чекбокс
+    «Повторять» стоит слева от метки. ``background`` помещает карточку на
+    большой серый «экран», ``noise`` — СКО гауссова шума в уровнях яркости.
+    В ``lines`` добавляются эталонные строки в формате OCR с рамками текста.
+    """
+    rng = rng or random.Random()
+    s = lambda v: int(round(v * scale))
+    font = ImageFont.truetype(font_path, s(14))
+    card_w, card_h = s(520), s(360)
+    card = Image.new("RGB", (card_w, card_h), "white")
+    draw = ImageDraw.Draw(card)
+    label_x, value_x, row_h = s(20), s(160), s(40)
+    gray, black = (110, 110, 110), (20, 20, 20)
+    # Рамка пустого чекбокса светлее CHECKBOX_THRESHOLD, как в интерфейсе
+    outline = (215, 215, 215)
+
+    placed: List[Dict] = []
+
+    def row(i: int) -> int:
+        return s(24) + i * row_h
+
+    def text(xy: Tuple[int, int], value: str, fill: Tuple[int, int, int]) -> None:
+        draw.text(xy, value, fill=fill, font=font)
+        x1, y1, x2, y2 = draw.textbbox(xy, value, font=font)
+        placed.append({"text": value, "score": 1.0, "bbox": [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]})
+
+    text((label_x, row(0)), "Организатор", fill=gray)
+    text((value_x, row(0)), f"{truth['name']} {truth['last_name']}", fill=black)
+    text((label_x, row(1)), "Участники", fill=gray)
+    text((value_x, row(1)), f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", fill=black)
+    text((label_x, row(2)), "Время и дата", fill=gray)
+    text((value_x, row(2)), truth["start"], fill=black)
+    text((value_x + s(60), row(2)), "–", fill=black)
+    text((value_x + s(80), row(2)), truth["end"], fill=black)
+    text((value_x + s(150), row(2)), truth["date"], fill=black)
+    text((label_x, row(3)), "Переговорка", fill=gray)
+    text((value_x, row(3)), truth["bz"], fill=black)
+    text((value_x, row(4)), truth["room"], fill=black)
+
+    repeat_x = value_x + s(28)
+    box = s(16)
+    box_x, box_y = value_x, row(5) + s(1)
+    if truth["meeting_type"] == "Регулярная":
+        draw.rectangle([box_x, box_y, box_x + box, box_y + box], fill=(40, 90, 220))
+        draw.line(
+            [(box_x + s(3), box_y + s(8)), (box_x + s(7), box_y + s(12)), (box_x + s(13), box_y + s(4))],
+            fill="white", width=max(1, s(2)),
+        )
+    else:
+        draw.rectangle([box_x, box_y, box_x + box, box_y + box], outline=outline, width=max(1, s(1)))
+    text((repeat_x, row(5)), "Повторять", fill=black)
+    text((label_x, row(6)), "Описание", fill=gray)
+    text((value_x, row(6)), "Обсуждение задач", fill=black)
+    draw.rectangle([0, 0, card_w - 1, card_h - 1], outline=(210, 210, 210))
+
+    image = card
+    x = y = 0
+    if background:
+        screen = Image.new("RGB", (max(s(1920), card_w + 100), max(s(1080), card_h + 100)), (90, 95, 105))
+        x = rng.randrange(0, screen.width - card_w)
+        y = rng.randrange(0, screen.height - card_h)
+        screen.paste(card, (x, y))
+        image = screen
+    if lines is not None:
+        for line in placed:
+            line["bbox"] = [[px + x, py + y] for px, py in line["bbox"]]
+        lines.extend(placed)
+    if noise > 0:
+        arr = np.asarray(image, dtype=np.float32)
+        arr += np.random.default_rng(rng.randrange(2**32)).normal(0, noise, arr.shape)
+        image = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8))
+    return image
+
+
+def generate(out_dir: str | Path, count: int, *, seed: int = 0) -> List[Path]:
+    """Сгенерировать ``count`` изображений с эталонным JSON рядом с каждым.
+
+    JSON содержит ``expected`` и эталонные ``lines``, поэтому подходит как
+    корпус для ``replay`` и ``tune`` без запуска OCR.
+    """
+    from constants import rooms_by_bz
+
+    fonts = available_fonts()
+    if not fonts:
+        raise RuntimeError("Не найден ни один шрифт с кириллицей из FONT_CANDIDATES")
+    rng = random.Random(seed)
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    created = []
+    for i in range(count):
+        truth = _random_truth(rng, rooms_by_bz)
+        params = {
+            "font": rng.choice(fonts),
+            "scale": rng.choice(RENDER_SCALES),
+            "noise": rng.choice((0.0, 0.0, 4.0, 8.0)),
+            "background": rng.random() < 0.3,
+        }
+        lines: List[Dict] = []
+        image = render_card(
+            truth,
+            font_path=params["font"],
+            scale=params["scale"],
+            noise=params["noise"],
+            background=params["background"],
+            rng=rng,
+            lines=lines,
+        )
+        path = out / f"card_{i:04d}.png"
+        image.save(path)
+        expected = {k: truth[k] for k in FIELDS}
+        path.with_suffix(".json").write_text(
+            json.dumps(
+                {
+                    "expected": expected,
+                    "render": params,
+                    "image": path.name,
+                    "scale": params["scale"],
+                    "offset": [0, 0],
+                    "lines": lines,
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        created.append(path)
+    return created
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def benchmark(
+    data_dir: str | Path,
+    *,
+    engines: List[str],
+    scales: List[float | None],
+    use_gpu: bool = False,
+    two_stage: bool = False,
+) -> List[Dict]:
+    """Измерить точность по полям и задержку p50/p95 для движков и масштабов."""
+    from constants import rooms_by_bz
+    from logic.ocr_paddle import (
+        ROOM_FUZZY_THRESHOLD,
+        fields_from_lines,
+        run_ocr,
+        validate_with_rooms,
+    )
+
+    samples: List[Tuple[Image.Image, Dict]] = []
+    for img_path in sorted(Path(data_dir).glob("*.png")):
+        meta = json.loads(img_path.with_suffix(".json").read_text(encoding="utf-8"))
+        samples.append((Image.open(img_path).convert("RGB"), meta["expected"]))
+    if not samples:
+        raise RuntimeError(f"В {data_dir} нет изображений, сначала выполните generate")
+
+    reports = []
+    for engine in engines:
+        for scale in scales:
+            latencies: List[float] = []
+            correct = {k: 0 for k in FIELDS}
+            all_correct = 0
+            # прогрев модели, чтобы загрузка не попала в замеры
+            options = {
+                "engine": engine,
+                "use_gpu": use_gpu,
+                "use_cache": False,
+                "scale": scale,
+                "two_stage": two_stage,
+            }
+            run_ocr(samples[0][0], **options)
+            for image, expected in samples:
+                start = time.perf_counter()
+                lines, meeting_type = run_ocr(image, **options)
+                parsed, _ = fields_from_lines(lines)
+                fields = validate_with_rooms(
+                    parsed, rooms_by_bz, fuzzy_threshold=ROOM_FUZZY_THRESHOLD
+                )
+                latencies.append(time.perf_counter() - start)
+                fields["meeting_type"] = meeting_type
+                hits = [fields.get(k, "") == expected.get(k, "") for k in FIELDS]
+                for key, hit in zip(FIELDS, hits):
+                    correct[key] += hit
+                all_correct += all(hits)
+            n = len(samples)
+            reports.append({
+                "engine": engine,
+                "scale": scale or "auto",
+                "two_stage": two_stage,
+                "images": n,
+                "p50_ms": round(_percentile(latencies, 0.5) * 1000, 1),
+                "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+                "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+                "accuracy": {k: round(v / n, 3) for k, v in correct.items()},
+                "all_fields": round(all_correct / n, 3),
+            })
+    return reports
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m logic.ocr_synth")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="сгенерировать синтетические скриншоты")
+    gen.add_argument("out_dir")
+    gen.add_argument("-n", "--count", type=int, default=100)
+    gen.add_argument("--seed", type=int, default=0)
+
+    bench = sub.add_parser("bench", help="замерить точность и задержку")
+    bench.add_argument("data_dir")
+    bench.add_argument("--engine", nargs="+", default=["EasyOCR"])
+    bench.add_argument("--scale", nargs="+", default=["auto"])
+    bench.add_argument("--gpu", action="store_true")
+    bench.add_argument("--two-stage", action="store_true", help="распознавать только рядом с метками")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, force=True)
+    if args.command == "generate":
+        paths = generate(args.out_dir, args.count, seed=args.seed)
+        print(f"Создано изображений: {len(paths)} в {args.out_dir}")
+        return
+
+    scales = [None if s == "auto" else float(s) for s in args.scale]
+    out = sys.stdout
+    reports = benchmark(
+        args.data_dir,
+        engines=args.engine,
+        scales=scales,
+        use_gpu=args.gpu,
+        two_stage=args.two_stage,
+    )
+    for report in reports:
+        out.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Прямоугольник (x1, y1, x2, y2) в пикселях исходного скриншота
+Rect = Tuple[int, int, int, int]
+
+
+def template_key(size: Tuple[int, int], scale: float | None) -> str:
+    """Вернуть ключ шаблона по размеру скриншота и запрошенному масштабу."""
+    return f"{size[0]}x{size[1]}:{scale or 'auto'}"
+
+
+class LayoutTemplates:
+    """Выученные раскладки карточки встречи для повторяющихся скриншотов.
+
+    Шаблон хранит масштаб распознавания, метки-якоря с их рамками и
+    области значений (по одной на ряд) в координатах исходного скриншота.
+    """
+
+    def __init__(self, max_size: int = 8, path: str | Path | None = None) -> None:
+        """Создать хранилище и при наличии ``path`` загрузить его с диска."""
+        self.max_size = max_size
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.load()
+
+    def get(self, key: str) -> Dict | None:
+        """Вернуть шаблон по ключу или ``None``."""
+        with self._lock:
+            template = self._items.get(key)
+            if template is not None:
+                self._items.move_to_end(key)
+            return template
+
+    def learn(
+        self,
+        key: str,
+        scale: float,
+        anchors: List[Dict],
+        regions: List[Dict],
+    ) -> None:
+        """Сохранить шаблон: ``anchors`` — ``{"text", "rect"}``,
+        ``regions`` — ``{"rect", "allowlist"}``."""
+        with self._lock:
+            self._items[key] = {"scale": scale, "anchors": anchors, "regions": regions}
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        logging.debug(
+            "[OCR] Learned layout template %s: %d anchors, %d regions",
+            key,
+            len(anchors),
+            len(regions),
+        )
+        self.save()
+
+    def forget(self, key: str) -> None:
+        """Удалить шаблон, который перестал совпадать со скриншотами."""
+        with self._lock:
+            removed = self._items.pop(key, None) is not None
+        if removed:
+            self.save()
+
+    def record(self, hit: bool) -> None:
+        """Учесть попадание или промах шаблона."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Вернуть число шаблонов и попаданий/промахов."""
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+    def load(self) -> None:
+        """Загрузить шаблоны из файла."""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            with self._lock:
+                self._items = OrderedDict(data)
+        except Exception as e:
+            logging.warning("[OCR] Failed to load layout templates: %s", e)
+
+    def save(self) -> None:
+        """Сохранить шаблоны в файл."""
+        if not self.path:
+            return
+        with self._lock:
+            data = dict(self._items)
+        try:
+            self.path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        except Exception as e:
+            logging.warning("[OCR] Failed to save layout templates: %s", e)
@@ -0,0 +1,243 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from logic.ocr_engines import OcrEngine, OcrResult
+from logic.ocr_registry import READER_MEMORY_BUDGET_MB
+
+# Плитки для очень больших кадров (4K и несколько мониторов после увеличения)
+TILE_SIZE = 2048
+TILE_OVERLAP = 256
+TILE_MIN_PIXELS = 4096 * 2160
+TILE_MAX_WORKERS = 4
+# Доля площади рамки внутри другой, при которой она считается дублем
+TILE_CONTAINMENT = 0.8
+# Допуск по вертикали для частей одной строки с соседних плиток, px
+TILE_ROW_TOLERANCE = 25
+# Память одного процесса плиток с EasyOCR ru+en на CPU (модель и PyTorch), МБ
+TILE_WORKER_RSS_MB = 700
+# Сколько символов на краю плитки могут быть прочитаны неверно
+TILE_EDGE_CHARS = 2
+# Минимальное совпадение текста частей строки в зоне перекрытия
+TILE_MIN_TEXT_OVERLAP = 3
+
+_worker_options: Dict = {}
+_pool = None
+_pool_key: Tuple | None = None
+_pool_lock = threading.Lock()
+
+
+def split_tiles(
+    width: int,
+    height: int,
+    size: int = TILE_SIZE,
+    overlap: int = TILE_OVERLAP,
+) -> List[Tuple[int, int, int, int]]:
+    """Разбить кадр на перекрывающиеся плитки ``(x, y, w, h)``."""
+
+    def starts(length: int) -> List[int]:
+        if length <= size:
+            return [0]
+        step = size - overlap
+        positions = list(range(0, length - size + 1, step))
+        if positions[-1] + size < length:
+            positions.append(length - size)
+        return positions
+
+    return [
+        (x, y, min(size, width - x), min(size, height - y))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+
+def _rect(bbox: List[List[float]]) -> Tuple[float, float, float, float]:
+    xs = [p[0] for p in bbox]
+    ys = [p[1] for p in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def dedupe_results(results: OcrResult, containment: float = TILE_CONTAINMENT) -> OcrResult:
+    """Убрать рамки, распознанные дважды в зоне перекрытия плиток.
+
+    Рамка отбрасывается, если почти целиком лежит внутри уже принятой:
+    так остаётся полная строка, а не её обрезок с края соседней плитки.
+    """
+    kept: OcrResult = []
+    kept_rects: List[Tuple[float, float, float, float]] = []
+
+    def area(r: Tuple[float, float, float, float]) -> float:
+        return max(0.0, r[2] - r[0]) * max(0.0, r[3] - r[1])
+
+    for result in sorted(results, key=lambda r: area(_rect(r[0])), reverse=True):
+        x1, y1, x2, y2 = rect = _rect(result[0])
+        own = area(rect) or 1.0
+        duplicate = False
+        for kx1, ky1, kx2, ky2 in kept_rects:
+            inter = max(0.0, min(x2, kx2) - max(x1, kx1)) * max(0.0, min(y2, ky2) - max(y1, ky1))
+            if inter >= containment * own:
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append(result)
+            kept_rects.append(rect)
+    return kept
+
+
+def _join_overlap(left: str, right: str) -> str:
+    """Склеить части строки, убрав текст, повторённый в зоне перекрытия.
+
+    Символы у самого края плитки часто разрезаны и прочитаны неверно,
+    поэтому до ``TILE_EDGE_CHARS`` из них отбрасываются перед сравнением.
+    """
+    best: Tuple[int, int, int] | None = None
+    for cut_left in range(TILE_EDGE_CHARS + 1):
+        head = left[:len(left) - cut_left] if cut_left else left
+        for cut_right in range(TILE_EDGE_CHARS + 1):
+            tail = right[cut_right:]
+            for size in range(min(len(head), len(tail)), TILE_MIN_TEXT_OVERLAP - 1, -1):
+                if head.endswith(tail[:size]):
+                    if best is None or size > best[0]:
+                        best = (size, cut_left, cut_right)
+                    break
+    if best is None:
+        return f"{left} {right}"
+    size, cut_left, cut_right = best
+    return left[:len(left) - cut_left] + right[cut_right + size:]
+
+
+def merge_row_pieces(results: OcrResult, y_tolerance: float = TILE_ROW_TOLERANCE) -> OcrResult:
+    """Соединить части строки, разрезанной швом между плитками.
+
+    Строка шире перекрытия не помещается целиком ни в одну плитку и
+    приходит двумя рамками. Рамки одного ряда (верх и низ различаются не
+    больше ``y_tolerance``), пересекающиеся по горизонтали, заменяются их
+    объединением, а текст склеивается без повтора.
+    """
+    merged: OcrResult = []
+    for bbox, text, score in sorted(results, key=lambda r: _rect(r[0])[0]):
+        x1, y1, x2, y2 = _rect(bbox)
+        for i, (m_bbox, m_text, m_score) in enumerate(merged):
+            mx1, my1, mx2, my2 = _rect(m_bbox)
+            if abs(my1 - y1) > y_tolerance or abs(my2 - y2) > y_tolerance:
+                continue
+            if x1 >= mx2 or mx1 >= x2:
+                continue
+            ux1, uy1, ux2, uy2 = min(mx1, x1), min(my1, y1), max(mx2, x2), max(my2, y2)
+            merged[i] = (
+                [[ux1, uy1], [ux2, uy1], [ux2, uy2], [ux1, uy2]],
+                _join_overlap(m_text, text),
+                min(m_score, score),
+            )
+            break
+        else:
+            merged.append((bbox, text, score))
+    return merged
+
+
+def _shift(results: OcrResult, x: int, y: int) -> OcrResult:
+    return [
+        ([[float(px) + x, float(py) + y] for px, py in bbox], text, float(score))
+        for bbox, text, score in results
+    ]
+
+
+def _init_worker(engine: str, use_gpu: bool, options: Dict, torch_threads: int) -> None:
+    """Загрузить модель OCR один раз на процесс."""
+    global _worker_options
+    if torch_threads > 0:
+        try:
+            import torch
+
+            torch.set_num_threads(torch_threads)
+        except Exception:
+            pass
+    from logic.ocr_paddle import _init_ocr
+
+    _init_ocr(use_gpu, engine, options)
+    _worker_options = {"use_gpu": use_gpu, "engine": engine, "options": options}
+
+
+def _read_tile(task: Tuple[int, int, np.ndarray]) -> OcrResult:
+    from logic.ocr_paddle import _init_ocr
+
+    x, y, tile = task
+    reader = _init_ocr(**_worker_options)
+    return _shift(reader.readtext(tile), x, y)
+
+
+def _get_pool(engine: str, use_gpu: bool, options: Dict, workers: int):
+    """Вернуть пул процессов с прогретыми моделями, создав его при первом вызове."""
+    global _pool, _pool_key
+    key = (engine, use_gpu, tuple(sorted(options.items())), workers)
+    with _pool_lock:
+        if _pool is None or _pool_key != key:
+            if _pool is not None:
+                _pool.terminate()
+            torch_threads = max(1, (os.cpu_count() or 1) // workers)
+            logging.debug("[OCR] Starting %d tile workers", workers)
+            _pool = multiprocessing.get_context("spawn").Pool(
+                workers,
+                initializer=_init_worker,
+                initargs=(engine, use_gpu, options, torch_threads),
+            )
+            _pool_key = key
+        return _pool
+
+
+def shutdown_tile_pool() -> None:
+    """Остановить процессы распознавания плиток."""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.terminate()
+        _pool = None
+        _pool_key = None
+
+
+atexit.register(shutdown_tile_pool)
+
+
+def read_tiled(
+    image: np.ndarray,
+    reader: OcrEngine,
+    *,
+    engine: str,
+    use_gpu: bool = False,
+    options: Dict | None = None,
+    workers: int = 0,
+    y_tolerance: float = TILE_ROW_TOLERANCE,
+) -> OcrResult:
+    """Распознать большой кадр по плиткам и собрать строки обратно.
+
+    Плитки распознаются параллельно в процессах с собственными моделями;
+    на GPU, при одном процессе или внутри демонического процесса (пул
+    пакетной обработки, процесс OCR), которому нельзя порождать дочерние,
+    — по очереди моделью ``reader``. Дубли из зон перекрытия убираются,
+    а части строк, разрезанных швом, соединяются (``merge_row_pieces``).
+
+    Размером плитки ограничена память под изображение и активации сети,
+    но каждый процесс держит свою копию модели: общая память растёт на
+    ``TILE_WORKER_RSS_MB`` (около 700 МБ) с каждым процессом, поэтому их
+    число ограничено и бюджетом ``READER_MEMORY_BUDGET_MB``.
+    """
+    h, w = image.shape[:2]
+    tiles = split_tiles(w, h)
+    workers = workers or min(TILE_MAX_WORKERS, os.cpu_count() or 1)
+    workers = min(workers, len(tiles), max(1, READER_MEMORY_BUDGET_MB // TILE_WORKER_RSS_MB))
+    logging.debug("[OCR] Tiled OCR: %dx%d -> %d tiles, %d workers", w, h, len(tiles), workers)
+    tasks = ((x, y, np.ascontiguousarray(image[y:y + th, x:x + tw])) for x, y, tw, th in tiles)
+    results: OcrResult = []
+    if use_gpu or workers <= 1 or multiprocessing.current_process().daemon:
+        for x, y, tile in tasks:
+            results.extend(_shift(reader.readtext(tile), x, y))
+    else:
+        pool = _get_pool(engine, use_gpu, options or {}, workers)
+        for part in pool.imap_unordered(_read_tile, tasks):
+            results.extend(part)
+    return merge_row_pieces(dedupe_results(results), y_tolerance)
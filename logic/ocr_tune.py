@@ -0,0 +1,209 @@
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+from PIL import Image
+
+from logic.ocr_replay import FIELDS, find_debug_json, load_debug_json
+
+# Подбираемые константы logic.ocr_paddle и их возможные значения
+PARAM_SPACE: Dict[str, tuple] = {
+    "ROOM_FUZZY_THRESHOLD": (0.5, 0.55, 0.6, 0.65, 0.7, 0.75),
+    "ROOM_TOKEN_THRESHOLD": (0.3, 0.4, 0.5, 0.6),
+    "LABEL_SIMILARITY": (60, 65, 70, 75, 80),
+    "BBOX_Y_TOLERANCE": (15, 20, 25, 30, 40),
+    "SPLIT_TOKEN_MAX_GAP": (40, 55, 70, 90),
+    "CHECKBOX_X_OFFSET": (45, 50, 55, 60, 65),
+    "CHECKBOX_SIZE": (29, 33, 37, 41),
+    "CHECKBOX_THRESHOLD": (150, 170, 190, 210),
+    "CHECKBOX_DARK_RATIO": (0.04, 0.07, 0.1, 0.15),
+}
+CHECKBOX_PARAMS = {"CHECKBOX_X_OFFSET", "CHECKBOX_SIZE", "CHECKBOX_THRESHOLD", "CHECKBOX_DARK_RATIO"}
+
+_corpus: List[Dict] = []
+
+
+def load_corpus(root: str | Path) -> List[Dict]:
+    """Загрузить размеченные JSON: строки OCR и эталон ``expected``.
+
+    Если в JSON указан ``image`` (чистое изображение в координатах рамок),
+    по нему дополнительно проверяется тип встречи по чекбоксу.
+    """
+    corpus = []
+    for path in find_debug_json(root):
+        try:
+            lines, meta = load_debug_json(path)
+        except (ValueError, OSError) as e:
+            logging.warning("[TUNE] Skip %s: %s", path, e)
+            continue
+        if not lines or not meta.get("expected"):
+            continue
+        item = {
+            "file": str(path),
+            "lines": lines,
+            "expected": meta["expected"],
+            "image": None,
+            "scale": float(meta.get("scale") or 2.0),
+            "offset": tuple(meta.get("offset") or (0, 0)),
+        }
+        if meta.get("image") and "meeting_type" in meta["expected"]:
+            image_path = Path(path).parent / meta["image"]
+            if image_path.is_file():
+                item["image"] = np.array(Image.open(image_path).convert("RGB"))
+        corpus.append(item)
+    return corpus
+
+
+def _init_worker(root: str, log_level: int) -> None:
+    """Загрузить корпус один раз на процесс."""
+    global _corpus
+    logging.getLogger().setLevel(log_level)
+    _corpus = load_corpus(root)
+
+
+def current_params() -> Dict:
+    """Вернуть текущие значения подбираемых констант."""
+    import logic.ocr_paddle as ocr
+
+    return {name: getattr(ocr, name) for name in PARAM_SPACE}
+
+
+def evaluate(params: Dict) -> Dict:
+    """Прогнать корпус с заданными константами и посчитать метрики.
+
+    ``accuracy`` — доля верных полей, ``fallback_rate`` — доля файлов, где
+    разбора по геометрии не хватило и запускался запасной проход по тексту.
+    """
+    import logic.ocr_paddle as ocr
+    from logic.ocr_replay import replay_lines
+
+    for name, value in params.items():
+        setattr(ocr, name, value)
+
+    correct = {k: 0 for k in (*FIELDS, "meeting_type")}
+    total = dict.fromkeys(correct, 0)
+    fallbacks = 0
+    start = time.perf_counter()
+    for item in _corpus:
+        layout = ocr.parse_fields_layout([dict(l) for l in item["lines"]])
+        fallbacks += not (layout["name"] and layout["bz_raw"] and layout["room_raw"])
+        fields, _ = replay_lines(item["lines"])
+        expected = item["expected"]
+        if item["image"] is not None:
+            lines = [dict(l) for l in item["lines"]]
+            fields["meeting_type"], _, _ = ocr.detect_repeat_checkbox(
+                item["image"], lines, offset=item["offset"], scale=item["scale"]
+            )
+        for key in correct:
+            if key in expected and key in fields:
+                total[key] += 1
+                correct[key] += fields[key] == expected[key]
+    n = len(_corpus) or 1
+    checked = sum(total.values()) or 1
+    return {
+        "params": params,
+        "accuracy": round(sum(correct.values()) / checked, 4),
+        "fallback_rate": round(fallbacks / n, 4),
+        "field_accuracy": {
+            k: round(correct[k] / total[k], 4) for k in correct if total[k]
+        },
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def grid_configs(base: Dict, names: List[str]) -> Iterator[Dict]:
+    """Перебрать все сочетания значений для ``names``, остальные — из ``base``."""
+    for values in itertools.product(*(PARAM_SPACE[n] for n in names)):
+        yield {**base, **dict(zip(names, values))}
+
+
+def random_configs(base: Dict, names: List[str], count: int, seed: int) -> Iterator[Dict]:
+    """Сгенерировать ``count`` случайных сочетаний значений для ``names``."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {**base, **{n: rng.choice(PARAM_SPACE[n]) for n in names}}
+
+
+def pareto_front(results: List[Dict]) -> List[Dict]:
+    """Оставить результаты, не доминируемые по точности и доле запасных проходов."""
+    ordered = sorted(results, key=lambda r: (-r["accuracy"], r["fallback_rate"]))
+    front: List[Dict] = []
+    best_fallback = float("inf")
+    for result in ordered:
+        if result["fallback_rate"] < best_fallback:
+            front.append(result)
+            best_fallback = result["fallback_rate"]
+    return front
+
+
+def run_tuning(
+    root: str | Path,
+    configs: List[Dict],
+    *,
+    workers: int = 0,
+) -> List[Dict]:
+    """Оценить конфигурации пулом процессов и вернуть все результаты."""
+    workers = min(workers or os.cpu_count() or 1, len(configs)) or 1
+    initargs = (str(root), logging.ERROR)
+    with multiprocessing.get_context("spawn").Pool(
+        workers, initializer=_init_worker, initargs=initargs
+    ) as pool:
+        return list(pool.imap_unordered(evaluate, configs, chunksize=4))
+
+
+def main(argv: List[str]) -> None:
+    """Точка входа ``python -m logic.ocr_paddle tune <json|dir>``.
+
+    Печатает фронт Парето (точность против доли запасных проходов)
+    по одной JSON-записи на строку.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m logic.ocr_paddle tune")
+    parser.add_argument("path", help="размеченный JSON или папка с ними")
+    parser.add_argument("-p", "--params", nargs="+", choices=list(PARAM_SPACE),
+                        help="какие константы подбирать (по умолчанию все)")
+    parser.add_argument("--grid", action="store_true", help="полный перебор вместо случайного")
+    parser.add_argument("-n", "--samples", type=int, default=200, help="число случайных конфигураций")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--workers", type=int, default=0, help="число процессов")
+    parser.add_argument("--all", action="store_true", help="печатать все результаты, а не только фронт")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    base = current_params()
+    corpus = load_corpus(args.path)
+    if not corpus:
+        print(f"[TUNE] No labelled JSON with 'expected' in {args.path}", file=sys.stderr)
+        sys.exit(2)
+    names = args.params or list(PARAM_SPACE)
+    if not any(item["image"] is not None for item in corpus):
+        names = [n for n in names if n not in CHECKBOX_PARAMS]
+    configs = (
+        list(grid_configs(base, names))
+        if args.grid
+        else list(random_configs(base, names, args.samples, args.seed))
+    )
+    configs.insert(0, base)
+
+    start = time.perf_counter()
+    results = run_tuning(args.path, configs, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    baseline = next(r for r in results if r["params"] == base)
+    out = sys.stdout
+    for result in results if args.all else pareto_front(results):
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    print(
+        f"[TUNE] {len(configs)} configs x {len(corpus)} files in {elapsed:.1f}s; "
+        f"baseline accuracy {baseline['accuracy']:.3f}, "
+        f"fallback rate {baseline['fallback_rate']:.3f}",
+        file=sys.stderr,
+    )
@@ -0,0 +1,397 @@
+import atexit
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from logic.ocr_debug import DEBUG_OFF
+from logic.ocr_registry import process_rss
+
+# Как часто проверять отмену задачи и состояние процесса, с
+WORKER_POLL_INTERVAL = 0.1
+# Сколько раз перезапускать упавший процесс для одной задачи
+WORKER_RETRIES = 1
+# Сколько ждать завершения процесса при остановке, с
+WORKER_JOIN_TIMEOUT = 5
+
+_pool: "OcrWorkerPool | None" = None
+_pool_key: Tuple | None = None
+_pool_lock = threading.Lock()
+
+
+class OcrWorkerCrashed(RuntimeError):
+    """Процесс OCR завершился, не вернув результат."""
+
+
+class _RemoteJob:
+    """Задача в процессе OCR: этапы отправляются в главный процесс по каналу."""
+
+    cancelled = False
+
+    def __init__(self, conn, request_id: int) -> None:
+        self._conn = conn
+        self._id = request_id
+
+    def check(self) -> None:
+        pass
+
+    def report(self, stage: str, percent: int) -> None:
+        self._conn.send({"id": self._id, "progress": (stage, percent)})
+
+
+def _worker_main(
+    conn,
+    engine: str,
+    use_gpu: bool,
+    options: Dict,
+    templates: Tuple[bool, bool],
+    torch_threads: int,
+) -> None:
+    """Цикл процесса OCR: изображение из общей памяти, строки — в канал."""
+    if torch_threads > 0:
+        try:
+            import torch
+
+            torch.set_num_threads(torch_threads)
+        except Exception:
+            pass
+    import logic.ocr_paddle as ocr
+
+    ocr.configure_ocr_cache(*templates)
+    ocr._init_ocr(use_gpu, engine, options)
+    last: Tuple[int, Dict | None] = (-1, None)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        request_id = msg["id"]
+        if msg["cmd"] == "feedback":
+            if last[0] == request_id:
+                ocr._finish_capture(last[1], msg["validated"], msg["debug_mode"])
+            continue
+        shm = None
+        try:
+            shm = shared_memory.SharedMemory(name=msg["shm"])
+            result, capture = _recognize_shared(
+                ocr,
+                shm,
+                msg,
+                use_gpu=use_gpu,
+                engine=engine,
+                engine_options=options,
+                use_cache=False,
+                workers=0,
+                job=_RemoteJob(conn, request_id),
+            )
+            last = (request_id, capture)
+            conn.send({"id": request_id, "result": result})
+        except Exception as e:
+            logging.error("[OCR] Worker request failed: %s", e)
+            conn.send({"id": request_id, "error": f"{type(e).__name__}: {e}"})
+        finally:
+            if shm is not None:
+                try:
+                    shm.close()
+                except BufferError:
+                    logging.warning("[OCR] Shared image is still referenced, left to GC")
+
+
+def _recognize_shared(ocr, shm, msg: Dict, **options) -> Tuple[Tuple, Dict | None]:
+    """Распознать изображение прямо в общей памяти, не копируя его.
+
+    Ссылки на сегмент не переживают вызов: при включённой отладке кадр
+    копируется, иначе отладочной записи изображение не нужно.
+    """
+    image = np.ndarray(msg["shape"], dtype=msg["dtype"], buffer=shm.buf)
+    debug = msg["kwargs"].get("debug_mode", DEBUG_OFF) != DEBUG_OFF
+    if debug:
+        image = image.copy()
+    result = ocr.run_ocr(image, **options, **msg["kwargs"])
+    capture = getattr(ocr._debug_local, "capture", None)
+    if capture is not None and not debug:
+        capture["image"] = None
+    return result, capture
+
+
+class OcrWorker:
+    """Постоянный процесс с прогретой моделью OCR.
+
+    Изображение передаётся через ``multiprocessing.shared_memory`` без
+    сериализации, строки OCR возвращаются по каналу. Упавший процесс
+    перезапускается при следующем обращении.
+    """
+
+    def __init__(
+        self,
+        engine: str,
+        use_gpu: bool = False,
+        options: Dict | None = None,
+        templates: Tuple[bool, bool] = (True, False),
+        torch_threads: int = 0,
+    ) -> None:
+        self.engine = engine
+        self.use_gpu = use_gpu
+        self.options = options or {}
+        self.templates = templates
+        self.torch_threads = torch_threads
+        self.restarts = 0
+        self.process = None
+        self._conn = None
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Запустить процесс, если он ещё не запущен или упал."""
+        if self.process is not None and self.process.is_alive():
+            return
+        if self.process is not None:
+            logging.warning(
+                "[OCR] Worker %s exited with code %s, restarting",
+                self.process.pid,
+                self.process.exitcode,
+            )
+            self.restarts += 1
+            self._conn.close()
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(
+                child,
+                self.engine,
+                self.use_gpu,
+                self.options,
+                self.templates,
+                self.torch_threads,
+            ),
+            name="ocr-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        logging.debug("[OCR] Started worker %s (%s)", self.process.pid, self.engine)
+
+    def stop(self) -> None:
+        """Остановить процесс."""
+        with self._lock:
+            if self.process is None:
+                return
+            try:
+                self._conn.send(None)
+            except (OSError, ValueError):
+                pass
+            if self.process.pid is not None:
+                self.process.join(WORKER_JOIN_TIMEOUT)
+                if self.process.is_alive():
+                    self.process.terminate()
+            self._conn.close()
+            self.process = None
+
+    def run(self, image: np.ndarray, kwargs: Dict, job: Any = None) -> Tuple[Tuple, int]:
+        """Распознать ``image`` в процессе и вернуть результат ``run_ocr``
+        и номер запроса.
+
+        При падении процесс перезапускается, а задача повторяется
+        ``WORKER_RETRIES`` раз.
+        """
+        for attempt in range(WORKER_RETRIES + 1):
+            try:
+                return self._run_once(image, kwargs, job)
+            except OcrWorkerCrashed:
+                if attempt == WORKER_RETRIES:
+                    raise
+        raise AssertionError("unreachable")
+
+    def _run_once(self, image: np.ndarray, kwargs: Dict, job: Any) -> Tuple[Tuple, int]:
+        shm = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+            with self._lock:
+                self.start()
+                request_id = next(self._ids)
+                try:
+                    self._conn.send({
+                        "cmd": "ocr",
+                        "id": request_id,
+                        "shm": shm.name,
+                        "shape": image.shape,
+                        "dtype": image.dtype.str,
+                        "kwargs": kwargs,
+                    })
+                except (OSError, ValueError) as e:
+                    raise OcrWorkerCrashed(str(e)) from e
+                while True:
+                    msg = self._receive(job)
+                    if msg.get("id") != request_id:
+                        # Ответ на отменённый ранее запрос
+                        continue
+                    if "progress" in msg:
+                        if job is not None:
+                            job.report(*msg["progress"])
+                        continue
+                    if "error" in msg:
+                        raise RuntimeError(msg["error"])
+                    return msg["result"], request_id
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _receive(self, job: Any) -> Dict:
+        while not self._conn.poll(WORKER_POLL_INTERVAL):
+            if job is not None:
+                job.check()
+            if not self.process.is_alive():
+                raise OcrWorkerCrashed(f"OCR worker exited with code {self.process.exitcode}")
+        try:
+            return self._conn.recv()
+        except (EOFError, OSError) as e:
+            raise OcrWorkerCrashed(str(e)) from e
+
+    def feedback(self, request_id: int, validated: Dict[str, str], debug_mode: str) -> None:
+        """Передать итог разбора полей: процесс выучит шаблон или сохранит отладку."""
+        with self._lock:
+            if self.process is None or not self.process.is_alive():
+                return
+            try:
+                self._conn.send({
+                    "cmd": "feedback",
+                    "id": request_id,
+                    "validated": validated,
+                    "debug_mode": debug_mode,
+                })
+            except (OSError, ValueError):
+                pass
+
+
+class OcrWorkerPool:
+    """Несколько процессов OCR; задача уходит первому свободному."""
+
+    def __init__(
+        self,
+        size: int,
+        engine: str,
+        use_gpu: bool = False,
+        options: Dict | None = None,
+        templates: Tuple[bool, bool] = (True, False),
+    ) -> None:
+        size = max(1, size)
+        # Несколько процессов делят ядра, один пользуется всеми
+        torch_threads = max(1, (os.cpu_count() or 1) // size) if size > 1 else 0
+        self.workers: List[OcrWorker] = [
+            OcrWorker(engine, use_gpu, options, templates, torch_threads) for _ in range(size)
+        ]
+        self._idle: "queue.Queue[OcrWorker]" = queue.Queue()
+        for worker in self.workers:
+            self._idle.put(worker)
+        self.last_used = time.monotonic()
+
+    def run(self, image: np.ndarray, kwargs: Dict, job: Any = None) -> Tuple[Tuple, OcrWorker, int]:
+        """Распознать ``image`` свободным процессом; вернуть и сам процесс."""
+        worker = self._idle.get()
+        try:
+            result, request_id = worker.run(image, kwargs, job)
+            return result, worker, request_id
+        finally:
+            self.last_used = time.monotonic()
+            self._idle.put(worker)
+
+    def busy(self) -> bool:
+        """Проверить, распознаёт ли сейчас какой-нибудь процесс."""
+        return self._idle.qsize() < len(self.workers)
+
+    def start(self) -> None:
+        """Запустить все процессы заранее, чтобы модели прогрелись."""
+        self.last_used = time.monotonic()
+        for worker in self.workers:
+            with worker._lock:
+                worker.start()
+
+    def stop(self) -> None:
+        """Остановить все процессы."""
+        for worker in self.workers:
+            worker.stop()
+
+    def stats(self) -> List[Dict]:
+        """Вернуть PID, число перезапусков и память каждого процесса."""
+        stats = []
+        for w in self.workers:
+            alive = w.process is not None and w.process.is_alive()
+            stats.append({
+                "pid": w.process.pid if w.process is not None else None,
+                "alive": alive,
+                "restarts": w.restarts,
+                "rss_mb": round(process_rss(w.process.pid) / 2**20, 1) if alive else 0.0,
+            })
+        return stats
+
+
+def get_worker_pool(
+    size: int,
+    engine: str,
+    use_gpu: bool = False,
+    options: Dict | None = None,
+    templates: Tuple[bool, bool] = (True, False),
+) -> OcrWorkerPool:
+    """Вернуть пул процессов OCR с такими параметрами, создав его при необходимости."""
+    global _pool, _pool_key
+    options = options or {}
+    key = (size, engine, use_gpu, tuple(sorted(options.items())), templates)
+    with _pool_lock:
+        if _pool is None or _pool_key != key:
+            if _pool is not None:
+                _pool.stop()
+            _pool = OcrWorkerPool(size, engine, use_gpu, options, templates)
+            _pool_key = key
+        return _pool
+
+
+def shutdown_workers() -> None:
+    """Остановить процессы OCR."""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.stop()
+        _pool = None
+        _pool_key = None
+
+
+def stop_idle_workers(idle_timeout: float) -> bool:
+    """Остановить процессы OCR, простаивающие дольше ``idle_timeout`` секунд.
+
+    Вернуть ``True``, если процессы были остановлены. При следующей задаче
+    они запустятся снова.
+    """
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is None or _pool.busy():
+            return False
+        if time.monotonic() - _pool.last_used <= idle_timeout:
+            return False
+        if not any(s["alive"] for s in _pool.stats()):
+            return False
+        _pool.stop()
+        _pool = None
+        _pool_key = None
+    logging.info("[OCR] Stopped idle OCR workers")
+    return True
+
+
+def worker_memory() -> Tuple[int, float]:
+    """Вернуть число запущенных процессов OCR и их общую память в МБ."""
+    with _pool_lock:
+        stats = _pool.stats() if _pool is not None else []
+    alive = [s for s in stats if s["alive"]]
+    return len(alive), round(sum((s["rss_mb"] for s in alive), 0.0), 1)
+
+
+atexit.register(shutdown_workers)
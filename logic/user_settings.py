@@ -10,6 +10,9 @@ class UserSettings:
         self.path = Path(path)
         self.theme = "Винтаж"
         self.ocr_mode = "CPU"
+        self.ocr_engine = "EasyOCR"
+        self.ocr_onnx_threads = 0
+        self.ocr_onnx_int8 = False
         self.animation_effect = "Glow"
         self.auto_copy = False
         self.auto_generate = False
@@ -17,6 +20,14 @@ class UserSettings:
         self.deepl_api_key = ""
         self.translator = "Google"
         self.show_help_icons = True
+        self.ocr_warmup = False
+        self.ocr_idle_unload = 15
+        self.ocr_preload = False
+        self.ocr_workers = 0
+        self.ocr_clipboard_watch = False
+        self.ocr_cache = True
+        self.ocr_cache_persist = False
+        self.ocr_debug_mode = "off"
 
         self.save_theme = True
         self.save_ocr_mode = True
@@ -39,6 +50,16 @@ class UserSettings:
                 self.save_auto_report = data.get("save_auto_report", True)
 
                 self.show_help_icons = data.get("show_help_icons", self.show_help_icons)
+                self.ocr_warmup = data.get("ocr_warmup", self.ocr_warmup)
+                self.ocr_idle_unload = data.get("ocr_idle_unload", self.ocr_idle_unload)
+                self.ocr_preload = data.get("ocr_preload", self.ocr_preload)
+                self.ocr_workers = data.get("ocr_workers", self.ocr_workers)
+                self.ocr_clipboard_watch = data.get(
+                    "ocr_clipboard_watch", self.ocr_clipboard_watch
+                )
+                self.ocr_cache = data.get("ocr_cache", self.ocr_cache)
+                self.ocr_cache_persist = data.get("ocr_cache_persist", self.ocr_cache_persist)
+                self.ocr_debug_mode = data.get("ocr_debug_mode", self.ocr_debug_mode)
 
                 self.deepl_api_key = data.get("deepl_api_key", self.deepl_api_key)
                 self.translator = data.get("translator", self.translator)
@@ -47,6 +68,9 @@ class UserSettings:
                     self.theme = data.get("theme", self.theme)
                 if self.save_ocr_mode:
                     self.ocr_mode = data.get("ocr_mode", self.ocr_mode)
+                    self.ocr_engine = data.get("ocr_engine", self.ocr_engine)
+                    self.ocr_onnx_threads = data.get("ocr_onnx_threads", self.ocr_onnx_threads)
+                    self.ocr_onnx_int8 = data.get("ocr_onnx_int8", self.ocr_onnx_int8)
                 if self.save_animation_effect:
                     self.animation_effect = data.get(
                         "animation_effect", self.animation_effect
@@ -65,6 +89,9 @@ class UserSettings:
         data = {
             "theme": self.theme,
             "ocr_mode": self.ocr_mode,
+            "ocr_engine": self.ocr_engine,
+            "ocr_onnx_threads": self.ocr_onnx_threads,
+            "ocr_onnx_int8": self.ocr_onnx_int8,
             "animation_effect": self.animation_effect,
             "auto_copy": self.auto_copy,
             "auto_generate": self.auto_generate,
@@ -72,6 +99,14 @@ class UserSettings:
             "deepl_api_key": self.deepl_api_key,
             "translator": self.translator,
             "show_help_icons": self.show_help_icons,
+            "ocr_warmup": self.ocr_warmup,
+            "ocr_idle_unload": self.ocr_idle_unload,
+            "ocr_preload": self.ocr_preload,
+            "ocr_workers": self.ocr_workers,
+            "ocr_clipboard_watch": self.ocr_clipboard_watch,
+            "ocr_cache": self.ocr_cache,
+            "ocr_cache_persist": self.ocr_cache_persist,
+            "ocr_debug_mode": self.ocr_debug_mode,
             "save_theme": self.save_theme,
             "save_ocr_mode": self.save_ocr_mode,
             "save_animation_effect": self.save_animation_effect,
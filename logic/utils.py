@@ -44,11 +44,12 @@ class _Task(QRunnable):
         except Exception as e:
             error = e
         logging.debug("[POOL] Задача завершена")
-        QTimer.singleShot(
-            0,
-            QApplication.instance(),
-            lambda r=result, e=error: self.callback((r, e)),
-        )
+        call_in_gui(lambda r=result, e=error: self.callback((r, e)))
+
+
+def call_in_gui(func) -> None:
+    """Выполнить функцию в главном потоке приложения."""
+    QTimer.singleShot(0, QApplication.instance(), func)
 
 
 def run_in_thread(func, callback):
@@ -20,4 +20,14 @@ if __name__ == "__main__":
     ctx.task_manager = TaskManager(ctx)
     window = MainWindow(ctx)
     window.show()
+    from logic.ocr_paddle import (
+        start_clipboard_watcher,
+        start_ocr_memory_manager,
+        warm_up_ocr,
+    )
+
+    start_ocr_memory_manager(ctx)
+    start_clipboard_watcher(ctx)
+    if ctx.ocr_warmup:
+        warm_up_ocr(ctx)
     sys.exit(app.exec())
@@ -0,0 +1,46 @@
+"""Разбор полей карточки встречи по геометрии строк OCR."""
+
+from logic.ocr_paddle import parse_fields_layout, parse_lines
+
+
+def _line(text, x1, y1, x2, y2, score=1.0):
+    return {"text": text, "score": score, "bbox": [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]}
+
+
+def _card(bz: str, room: str):
+    return [
+        _line("Организатор", 30, 41, 174, 60),
+        _line("Мария Козлова", 240, 41, 408, 60),
+        _line("Время и дата", 30, 161, 180, 180),
+        _line("13:00", 240, 161, 299, 176),
+        _line("–", 330, 169, 341, 176),
+        _line("13:30", 360, 161, 419, 176),
+        _line("18.05.2025", 465, 161, 583, 176),
+        _line("Переговорка", 30, 221, 173, 240),
+        _line(bz, 240, 220, 417, 240),
+        _line(room, 240, 280, 460, 300),
+        _line("Повторять", 282, 341, 398, 360),
+    ]
+
+
+def test_bz_without_bc_prefix_is_not_room():
+    fields = parse_fields_layout(_card("Офис Скайлайн", "6.Bajaga i Instruktori"))
+    assert fields["bz_raw"] == "Офис Скайлайн"
+    assert fields["room_raw"] == "6.Bajaga i Instruktori"
+
+
+def test_bz_with_bc_prefix():
+    fields = parse_fields_layout(_card("БЦ Нева", "Эрмитаж"))
+    assert fields["bz_raw"] == "БЦ Нева"
+    assert fields["room_raw"] == "Эрмитаж"
+
+
+def test_text_fallback_fills_name_and_room():
+    lines = [
+        _line("Организатор", 30, 41, 174, 60),
+        _line("Мария Козлова", 30, 80, 200, 100),
+        _line("Заячий Остров", 30, 300, 200, 320),
+    ]
+    fields, _ = parse_lines(lines)
+    assert fields["name"] == "Мария"
+    assert (fields["bz_raw"], fields["room_raw"]) == ("БЦ Бенуа", "1.Заячий Остров")
@@ -0,0 +1,37 @@
+"""Синтетические карточки для бенчмарка распознавания."""
+
+import random
+
+import pytest
+
+from logic.ocr_paddle import _prepare_lines, detect_repeat_checkbox
+from logic.ocr_synth import available_fonts, render_card
+
+TRUTH = {
+    "name": "Мария",
+    "last_name": "Козлова",
+    "date": "18.05.2025",
+    "start": "13:00",
+    "end": "13:30",
+    "bz": "БЦ Нева",
+    "room": "Эрмитаж",
+}
+
+
+@pytest.mark.parametrize("meeting_type", ["Обычная", "Регулярная"])
+@pytest.mark.parametrize("scale", [1.0, 2.0])
+def test_checkbox_round_trip(meeting_type, scale):
+    fonts = available_fonts()
+    if not fonts:
+        pytest.skip("нет шрифта с кириллицей")
+    lines = []
+    image = render_card(
+        {**TRUTH, "meeting_type": meeting_type},
+        font_path=fonts[0],
+        scale=scale,
+        background=True,
+        rng=random.Random(0),
+        lines=lines,
+    )
+    detected, _, _ = detect_repeat_checkbox(image, _prepare_lines(lines), scale=1.0)
+    assert detected == meeting_type
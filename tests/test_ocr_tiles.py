@@ -0,0 +1,60 @@
+"""Распознавание больших кадров по плиткам."""
+
+import multiprocessing
+
+import numpy as np
+
+from logic.ocr_tiles import TILE_SIZE, read_tiled, split_tiles
+
+
+def _box(x1, y1, x2, y2):
+    return [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+
+
+class _TileReader:
+    """Движок-заглушка: по одной строке в левом верхнем углу каждой плитки."""
+
+    def readtext(self, image):
+        return [([[0, 0], [40, 0], [40, 20], [0, 20]], "строка", 0.9)]
+
+
+def _read_in_worker(_):
+    image = np.zeros((100, TILE_SIZE * 2, 3), dtype=np.uint8)
+    return read_tiled(image, _TileReader(), engine="easyocr", workers=2)
+
+
+def test_read_tiled_in_daemonic_pool_worker():
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        results = pool.map(_read_in_worker, [0])[0]
+    assert len(results) == len(split_tiles(TILE_SIZE * 2, 100))
+    assert all(text == "строка" for _, text, _ in results)
+
+
+class _SeamReader:
+    """Движок-заглушка: строка шире перекрытия разрезана швом между плитками.
+
+    Край первой плитки режет последнюю букву, и она читается неверно.
+    """
+
+    def __init__(self, second_tile_x):
+        self._parts = iter([
+            [(_box(1700, 500, 2048, 530), "Обсуждение квартаn", 0.9)],
+            [(_box(1792 - second_tile_x, 502, 2200 - second_tile_x, 531), "ждение квартальных задач", 0.8)],
+        ])
+
+    def readtext(self, image):
+        return next(self._parts, [])
+
+
+def test_read_tiled_merges_line_across_seam():
+    width = 3840
+    tiles = split_tiles(width, 1000)
+    assert len(tiles) == 2 and tiles[1][0] < 2048
+    image = np.zeros((1000, width, 3), dtype=np.uint8)
+    results = read_tiled(image, _SeamReader(tiles[1][0]), engine="easyocr", workers=1)
+    assert len(results) == 1
+    bbox, text, score = results[0]
+    assert text == "Обсуждение квартальных задач"
+    assert (bbox[0], bbox[2]) == ([1700, 500], [2200, 531])
+    assert score == 0.8